@@ -10,7 +10,7 @@ from alembic import context
 from dotenv import load_dotenv
 
 from app.db.base import Base
-from app.db.models.user import User
+import app.db.models  # noqa: F401  (registers every table on Base.metadata)
 from app.core.config import settings
 
 # this is the Alembic Config object, which provides
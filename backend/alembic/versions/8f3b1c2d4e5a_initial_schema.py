@@ -0,0 +1,189 @@
+"""initial schema
+
+Revision ID: 8f3b1c2d4e5a
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+Matches what `Base.metadata.create_all` used to build at startup. Every step is
+idempotent, so databases created that way can be upgraded in place.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from fastapi_users_db_sqlalchemy import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b1c2d4e5a'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(company, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(role, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(notes, '')), 'C')"
+)
+
+
+def _select_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('color', sa.String(), nullable=True),
+        sa.Column('creator_id', GUID(), nullable=False),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(f'ix_{name}_id', name, ['id'], unique=False, if_not_exists=True)
+    op.create_index(f'ix_{name}_title', name, ['title'], unique=True, if_not_exists=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table(
+        'users',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('email', sa.String(length=320), nullable=False),
+        sa.Column('hashed_password', sa.String(length=1024), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('is_superuser', sa.Boolean(), nullable=False),
+        sa.Column('is_verified', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True, if_not_exists=True)
+
+    for name in ('tags', 'statuses', 'priorities'):
+        _select_table(name)
+
+    op.create_table(
+        'folders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('position', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('creator_id', GUID(), nullable=False),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_folders_id', 'folders', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_folders_title', 'folders', ['title'], unique=False, if_not_exists=True)
+
+    op.create_table(
+        'applications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('company', sa.String(), nullable=True),
+        sa.Column('closing_date', sa.Date(), nullable=True),
+        sa.Column('priority_id', sa.Integer(), nullable=True),
+        sa.Column('link', sa.String(), nullable=True),
+        sa.Column('status_id', sa.Integer(), nullable=True),
+        sa.Column('timeline', sa.JSON(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('role', sa.String(), nullable=True),
+        sa.Column('salary', sa.String(), nullable=True),
+        sa.Column('position', sa.Integer(), nullable=True),
+        sa.Column('starred', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('folder_id', sa.Integer(), nullable=True),
+        sa.Column('creator_id', GUID(), nullable=False),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['folder_id'], ['folders.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['priority_id'], ['priorities.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['status_id'], ['statuses.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    # added separately so tables created before full-text search get it too
+    op.execute(
+        "ALTER TABLE applications ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    )
+    op.create_index('ix_applications_id', 'applications', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_applications_title', 'applications', ['title'], unique=False, if_not_exists=True)
+    op.create_index('ix_applications_company', 'applications', ['company'], unique=False, if_not_exists=True)
+    op.create_index(
+        'ix_applications_search_vector', 'applications', ['search_vector'],
+        unique=False, postgresql_using='gin', if_not_exists=True,
+    )
+    op.create_index(
+        'ix_applications_company_trgm', 'applications', ['company'],
+        unique=False, postgresql_using='gin', postgresql_ops={'company': 'gin_trgm_ops'}, if_not_exists=True,
+    )
+
+    op.create_table(
+        'application_tags',
+        sa.Column('application_id', sa.Integer(), nullable=True),
+        sa.Column('tag_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        'folder_status_counts',
+        sa.Column('creator_id', GUID(), nullable=False),
+        sa.Column('folder_id', sa.Integer(), nullable=False),
+        sa.Column('status_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('creator_id', 'folder_id', 'status_id'),
+        if_not_exists=True,
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION folder_status_counts_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE folder_status_counts SET count = count - 1
+                WHERE creator_id = OLD.creator_id
+                  AND folder_id = coalesce(OLD.folder_id, 0)
+                  AND status_id = coalesce(OLD.status_id, 0);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO folder_status_counts (creator_id, folder_id, status_id, count)
+                VALUES (NEW.creator_id, coalesce(NEW.folder_id, 0), coalesce(NEW.status_id, 0), 1)
+                ON CONFLICT (creator_id, folder_id, status_id)
+                DO UPDATE SET count = folder_status_counts.count + 1;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE TRIGGER applications_folder_status_counts
+        AFTER INSERT OR DELETE OR UPDATE OF folder_id, status_id, creator_id ON applications
+        FOR EACH ROW EXECUTE FUNCTION folder_status_counts_apply()
+    """)
+    # Rebuild the summary from scratch; a no-op on a fresh database
+    op.execute("""
+        INSERT INTO folder_status_counts (creator_id, folder_id, status_id, count)
+        SELECT creator_id, coalesce(folder_id, 0), coalesce(status_id, 0), count(*)
+        FROM applications
+        GROUP BY 1, 2, 3
+        ON CONFLICT (creator_id, folder_id, status_id) DO UPDATE SET count = EXCLUDED.count
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS applications_folder_status_counts ON applications")
+    op.execute("DROP FUNCTION IF EXISTS folder_status_counts_apply()")
+    op.drop_table('folder_status_counts')
+    op.drop_table('application_tags')
+    op.drop_table('applications')
+    op.drop_table('folders')
+    for name in ('priorities', 'statuses', 'tags'):
+        op.drop_table(name)
+    op.drop_table('users')
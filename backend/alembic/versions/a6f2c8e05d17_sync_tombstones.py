@@ -0,0 +1,55 @@
+"""sync tombstones
+
+Revision ID: a6f2c8e05d17
+Revises: e1d94b7a3c52
+Create Date: 2026-10-18 13:00:00.000000
+
+Delta sync reads rows by updated_at and deletes from a tombstone log.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from fastapi_users_db_sqlalchemy import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f2c8e05d17'
+down_revision: Union[str, Sequence[str], None] = 'e1d94b7a3c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in ('tags', 'statuses', 'priorities'):
+        op.add_column(name, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.add_column('user_data_versions', sa.Column('tombstones_pruned_before', sa.DateTime(timezone=True), nullable=True))
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', GUID(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sync_tombstones_user_id_deleted_at', 'sync_tombstones', ['user_id', 'deleted_at'])
+
+    # Built without blocking writes, which needs to run outside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_folders_creator_id_updated_at', 'folders', ['creator_id', 'updated_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_folders_creator_id_updated_at', table_name='folders')
+    op.drop_index('ix_sync_tombstones_user_id_deleted_at', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_column('user_data_versions', 'tombstones_pruned_before')
+    for name in ('priorities', 'statuses', 'tags'):
+        op.drop_column(name, 'updated_at')
@@ -0,0 +1,63 @@
+"""ordering ranks
+
+Revision ID: b93e5d07c4f1
+Revises: a6f2c8e05d17
+Create Date: 2026-10-18 15:00:00.000000
+
+Applications and folders are ordered by fractional rank keys instead of integer positions.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b93e5d07c4f1'
+down_revision: Union[str, Sequence[str], None] = 'a6f2c8e05d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Existing rows keep their position order: the n-th row of a user gets "d" and n in four
+# base-62 digits, a valid key (app.core.ordering) that leaves room on both sides.
+BACKFILL = f"""
+UPDATE {{table}} SET rank = 'd'
+    || substr('{DIGITS}', (n / 238328) % 62 + 1, 1)
+    || substr('{DIGITS}', (n / 3844) % 62 + 1, 1)
+    || substr('{DIGITS}', (n / 62) % 62 + 1, 1)
+    || substr('{DIGITS}', n % 62 + 1, 1)
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY creator_id ORDER BY position NULLS LAST, id) AS n
+    FROM {{table}}
+) AS ordered
+WHERE {{table}}.id = ordered.id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('applications', 'folders'):
+        op.add_column(table, sa.Column('rank', sa.String(collation='C'), nullable=True))
+        op.execute(BACKFILL.format(table=table))
+
+    # Built without blocking writes, which needs to run outside the migration transaction
+    with op.get_context().autocommit_block():
+        for table in ('applications', 'folders'):
+            op.create_index(
+                f'ix_{table}_creator_id_rank_id', table, ['creator_id', 'rank', 'id'],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.drop_index(
+            'ix_folders_creator_id_position_id', table_name='folders',
+            postgresql_concurrently=True, if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_folders_creator_id_position_id', 'folders', ['creator_id', 'position', 'id'])
+    for table in ('folders', 'applications'):
+        op.drop_index(f'ix_{table}_creator_id_rank_id', table_name=table)
+        op.drop_column(table, 'rank')
@@ -0,0 +1,82 @@
+"""per-user composite indexes
+
+Revision ID: c4a7e9d21b36
+Revises: 8f3b1c2d4e5a
+Create Date: 2026-10-18 10:30:00.000000
+
+Indexes for the repository access paths: every query filters on creator_id first,
+then sorts by updated_at/position/id or filters by folder_id/status_id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e9d21b36'
+down_revision: Union[str, Sequence[str], None] = '8f3b1c2d4e5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # application_tags had no key: drop duplicate and dangling links before adding one
+    op.execute("""
+        DELETE FROM application_tags a USING application_tags b
+        WHERE a.ctid < b.ctid AND a.application_id = b.application_id AND a.tag_id = b.tag_id
+    """)
+    op.execute("DELETE FROM application_tags WHERE application_id IS NULL OR tag_id IS NULL")
+    # databases built by create_all already have it
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'application_tags_pkey') THEN
+                ALTER TABLE application_tags ADD CONSTRAINT application_tags_pkey PRIMARY KEY (application_id, tag_id);
+            END IF;
+        END
+        $$
+    """)
+
+    # Built without blocking writes, which needs to run outside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_application_tags_tag_id_application_id', 'application_tags', ['tag_id', 'application_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_applications_creator_id_updated_at', 'applications', ['creator_id', 'updated_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_applications_creator_id_folder_id_id', 'applications', ['creator_id', 'folder_id', sa.text('id DESC')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_applications_creator_id_status_id', 'applications', ['creator_id', 'status_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_folders_creator_id_position_id', 'folders', ['creator_id', 'position', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        for name in ('tags', 'statuses', 'priorities'):
+            op.create_index(
+                f'ix_{name}_creator_id', name, ['creator_id'],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in ('priorities', 'statuses', 'tags'):
+        op.drop_index(f'ix_{name}_creator_id', table_name=name)
+    op.drop_index('ix_folders_creator_id_position_id', table_name='folders')
+    op.drop_index('ix_applications_creator_id_status_id', table_name='applications')
+    op.drop_index('ix_applications_creator_id_folder_id_id', table_name='applications')
+    op.drop_index('ix_applications_creator_id_updated_at', table_name='applications')
+    op.drop_index('ix_application_tags_tag_id_application_id', table_name='application_tags')
+    op.drop_constraint('application_tags_pkey', 'application_tags', type_='primary')
+    op.alter_column('application_tags', 'tag_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('application_tags', 'application_id', existing_type=sa.Integer(), nullable=True)
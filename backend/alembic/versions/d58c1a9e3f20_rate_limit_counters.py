@@ -0,0 +1,37 @@
+"""rate limit counters
+
+Revision ID: d58c1a9e3f20
+Revises: b93e5d07c4f1
+Create Date: 2026-10-18 17:00:00.000000
+
+Fixed-window rate limit counts shared between workers when RATE_LIMIT_STORAGE=postgres.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58c1a9e3f20'
+down_revision: Union[str, Sequence[str], None] = 'b93e5d07c4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # unlogged: cheap writes, and a crash only resets the limits
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+        prefixes=['UNLOGGED'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rate_limit_counters')
@@ -0,0 +1,37 @@
+"""user data versions
+
+Revision ID: e1d94b7a3c52
+Revises: c4a7e9d21b36
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from fastapi_users_db_sqlalchemy import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1d94b7a3c52'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e9d21b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # no backfill: a user without a row is at version 0
+    op.create_table(
+        'user_data_versions',
+        sa.Column('user_id', GUID(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_data_versions')
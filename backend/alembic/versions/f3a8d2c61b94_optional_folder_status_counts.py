@@ -0,0 +1,44 @@
+"""optional folder status counts trigger
+
+Revision ID: f3a8d2c61b94
+Revises: d58c1a9e3f20
+Create Date: 2026-10-18 19:00:00.000000
+
+The trigger maintaining folder_status_counts now only exists in FOLDER_STATUS_COUNTS=summary
+mode. Deployments using summary mode run `python app/scripts/folder_status_counts.py enable`
+after this migration, which reinstalls it and backfills the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d2c61b94'
+down_revision: Union[str, Sequence[str], None] = 'd58c1a9e3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS applications_folder_status_counts ON applications")
+    op.execute("DELETE FROM folder_status_counts")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # folder_status_counts_apply() is kept by the upgrade
+    op.execute("""
+        CREATE OR REPLACE TRIGGER applications_folder_status_counts
+        AFTER INSERT OR DELETE OR UPDATE OF folder_id, status_id, creator_id ON applications
+        FOR EACH ROW EXECUTE FUNCTION folder_status_counts_apply()
+    """)
+    op.execute("DELETE FROM folder_status_counts")
+    op.execute("""
+        INSERT INTO folder_status_counts (creator_id, folder_id, status_id, count)
+        SELECT creator_id, coalesce(folder_id, 0), coalesce(status_id, 0), count(*)
+        FROM applications
+        GROUP BY 1, 2, 3
+    """)
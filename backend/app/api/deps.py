@@ -1,11 +1,15 @@
+from functools import cache
 from typing import Type
+import secrets
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import current_active_user
+from app.core.config import settings
 from app.db.models.user import User
 from app.db.session import get_async_session
+from app.repositories.ownership import load_owned
 
 
 def require_superuser(current_user: User = Depends(current_active_user)) -> User:
@@ -19,24 +23,36 @@ def require_superuser(current_user: User = Depends(current_active_user)) -> User
     return current_user
 
 
+@cache
 def require_owner(*, model: Type, owner_field: str = "creator_id"):
+    """Loads the path's resource if the current user may modify it.
+
+    One query scoped to the owner (a superuser sees everything), skipped when the row is already
+    in the session. The same dependency is returned per model, so FastAPI resolves it once per
+    request; routes hand the loaded object on to the service instead of fetching it again.
+    """
     async def _require_owner(
         resource_id: int,
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(current_active_user),
     ):
-        obj = await session.get(model, resource_id)
-
-        if not obj:
-            raise HTTPException(status_code=404, detail="Resource not found")
-
-        # grant modification privileges if the user is a superuser
-        if current_user.is_superuser:
-            return obj
+        return await load_owned(
+            session, model, resource_id, current_user.id, owner_field, superuser=current_user.is_superuser
+        )
 
-        if getattr(obj, owner_field) != current_user.id:
-            raise HTTPException(status_code=403, detail="You cannot update/delete this resource")
+    return _require_owner
 
-        return obj
 
-    return _require_owner
+def require_metrics_access(authorization: str | None = Header(None)) -> None:
+    """Lets scrapers that send `Authorization: Bearer <METRICS_TOKEN>` in; without a token
+    configured, metrics are only served in the local environment."""
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+        if not secrets.compare_digest((authorization or "").encode(), expected):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    elif settings.ENVIRONMENT != "local":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
@@ -0,0 +1,28 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+# Let browsers keep the response but revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the values a response is built from."""
+    return '"' + hashlib.sha256(repr(parts).encode()).hexdigest()[:32] + '"'
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response if the request's If-None-Match already names `etag`, else None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    # GET uses weak comparison, so W/ prefixes are ignored
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
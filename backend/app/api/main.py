@@ -4,6 +4,8 @@ from app.api.routes.folder import folder_router
 from app.api.routes.application import application_router
 from app.api.routes.selects import selects_router
 from app.api.routes.search import search_router
+from app.api.routes.metrics import metrics_router
+from app.api.routes.sync import sync_router
 
 api_router = APIRouter()
 
@@ -12,6 +14,8 @@ api_router.include_router(folder_router, prefix="/folders", tags=["folders"])
 api_router.include_router(application_router, prefix="/applications", tags=["applications"])
 api_router.include_router(selects_router, prefix="/selects", tags=["selects"])
 api_router.include_router(search_router, prefix="/search", tags=["search"])
+api_router.include_router(sync_router, prefix="/sync", tags=["sync"])
+api_router.include_router(metrics_router)
 
 @api_router.get("/")
 async def root():
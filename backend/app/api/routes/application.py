@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_async_session, require_owner
+from app.api.etag import make_etag, not_modified, cache_headers
 from app.core.auth import current_active_user
 from app.db.models.user import User
 from app.db.models.application import Application
-from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationRead
-from app.services.application import ApplicationService
+from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationRead, ApplicationBatchUpdate, ApplicationBatchRead
+from app.services.application import ApplicationService, Projection
+from app.services.sync import SyncService
+from app.services.application_import import ApplicationImportService, ImportFormat
+from app.services.application_export import ApplicationExportService, ExportFormat, MEDIA_TYPES
 from app.api.routes.limiter import limiter
-from typing import Literal
+from app.core.query_profile import query_budget
+from app.repositories.pagination import TotalMode
+from typing import List, Literal
 
 application_router = APIRouter()
 
@@ -22,8 +29,37 @@ async def create_application(
     service = ApplicationService(db)
     return await service.create_application(payload, current_user)
 
+@application_router.post("/bulk")
+@limiter.limit("5/minute")
+async def bulk_import_applications(
+    request: Request,
+    format: ImportFormat | None = None,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_active_user),
+):
+    # Format from the query string, else the body's content type
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "ndjson"
+    service = ApplicationImportService(db)
+    return await service.import_applications(request.stream(), format, current_user)
+
+# Drag and drop: many position/folder/status/starred changes in one transaction
+@application_router.patch("/batch", response_model=List[ApplicationBatchRead])
+@limiter.limit("30/minute")
+@query_budget(7)
+async def batch_update_applications(
+    request: Request,
+    payload: ApplicationBatchUpdate,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_active_user),
+):
+    service = ApplicationService(db)
+    return await service.batch_update_applications(payload, current_user)
+
 @application_router.put("/{resource_id}", response_model=ApplicationRead)
 @limiter.limit("5/minute")
+@query_budget(8)
 async def update_application(
     request: Request,
     resource_id: int,
@@ -33,10 +69,11 @@ async def update_application(
     current_user: User = Depends(current_active_user),
 ):
     service = ApplicationService(db)
-    return await service.update_application(resource_id, payload, current_user)
+    return await service.update_application(application, payload, current_user)
 
 @application_router.delete("/{resource_id}")
 @limiter.limit("5/minute")
+@query_budget(7)
 async def delete_application(
     request: Request,
     resource_id: int,
@@ -45,30 +82,70 @@ async def delete_application(
     current_user: User = Depends(current_active_user),
 ):
     service = ApplicationService(db)
-    await service.delete_application(resource_id, current_user)
+    await service.delete_application(application, current_user)
     return {"message": "Application deleted"}
 
+@application_router.get("/export")
+@limiter.limit("5/minute")
+async def export_applications(
+    request: Request,
+    format: ExportFormat = "csv",
+    query: str = None,
+    folder_id: int = None,
+    status_id: int = None,
+    priority_id: int = None,
+    starred: bool = None,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_active_user),
+):
+    filters = {
+        key: value for key, value in
+        {"folder_id": folder_id, "status_id": status_id, "priority_id": priority_id, "starred": starred}.items()
+        if value is not None
+    }
+    service = ApplicationExportService(db)
+    body = await service.export_applications(current_user, format, query, filters)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="applications.{format}"'},
+    )
+
 @application_router.get("/{application_id}", response_model=ApplicationRead)
 @limiter.limit("10/minute")
+@query_budget(5)
 async def get_application(
     request: Request,
+    response: Response,
     application_id: int,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(current_active_user),
 ):
     service = ApplicationService(db)
+    # Ownership never changes and deletes bump the version, so the version alone identifies the payload
+    version = await SyncService(db).get_version(current_user)
+    etag = make_etag("application", application_id, current_user.id, version)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    response.headers.update(cache_headers(etag))
     return await service.get_application(application_id, current_user)
 
 @application_router.get("/")
 @limiter.limit("10/minute")
+@query_budget(6)
 async def list_applications(
     request: Request,
     page: int = 1,
     per_page: int = 10,
     sort_by: str = "updated_at",
     sort_order: Literal["asc", "desc"] = "desc",
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str = None,
+    total: TotalMode = "exact",
+    fields: Projection = "full",
+    columns: str = None,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(current_active_user),
 ):
     service = ApplicationService(db)
-    return await service.list_applications(current_user, page, per_page, sort_by, sort_order)
+    return await service.list_applications(current_user, page, per_page, sort_by, sort_order, pagination, cursor, total, fields, columns)
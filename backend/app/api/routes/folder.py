@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_async_session, require_owner
+from app.api.etag import make_etag, not_modified, cache_headers
 from app.core.auth import current_active_user
 from app.db.models.user import User
 from app.db.models.folder import Folder
-from app.schemas.folder import FolderCreate, FolderUpdate, FolderRead
+from app.schemas.folder import FolderCreate, FolderUpdate, FolderRead, FolderBatchUpdate, FolderBatchRead
 from app.services.folder import FolderService
-from app.services.application import ApplicationService
+from app.services.application import ApplicationService, Projection
+from app.services.sync import SyncService
 from app.api.routes.limiter import limiter
-from typing import Literal
+from app.core.query_profile import query_budget
+from app.repositories.pagination import TotalMode
+from typing import List, Literal
 
 folder_router = APIRouter()
 
@@ -23,8 +27,22 @@ async def create_folder(
     service = FolderService(db)
     return await service.create_folder(payload, current_user)
 
+# Drag and drop: many folder moves in one transaction
+@folder_router.patch("/batch", response_model=List[FolderBatchRead])
+@limiter.limit("30/minute")
+@query_budget(6)
+async def batch_update_folders(
+    request: Request,
+    payload: FolderBatchUpdate,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_active_user),
+):
+    service = FolderService(db)
+    return await service.batch_update_folders(payload, current_user)
+
 @folder_router.put("/{resource_id}", response_model=FolderRead)
 @limiter.limit("5/minute")
+@query_budget(6)
 async def update_folder(
     request: Request,
     resource_id: int,
@@ -34,10 +52,11 @@ async def update_folder(
     current_user: User = Depends(current_active_user),
 ):
     service = FolderService(db)
-    return await service.update_folder(resource_id, payload, current_user)
+    return await service.update_folder(folder, payload, current_user)
 
 @folder_router.delete("/{resource_id}")
 @limiter.limit("5/minute")
+@query_budget(8)
 async def delete_folder(
     request: Request,
     resource_id: int,
@@ -46,43 +65,66 @@ async def delete_folder(
     current_user: User = Depends(current_active_user),
 ):
     service = FolderService(db)
-    await service.delete_folder(resource_id, current_user)
+    await service.delete_folder(folder, current_user)
     return {"message": "Folder deleted"}
 
 @folder_router.get("/dashboard")
 @limiter.limit("10/minute")
+@query_budget(8)
 async def get_dashboard(
     request: Request,
+    response: Response,
     page: int = 1,
     per_page: int = 10,
+    fields: Projection = "full",
+    columns: str = None,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(current_active_user),
 ):
     service = FolderService(db)
-    return await service.list_folders_recent_applications(current_user, page, per_page)
+    version = await SyncService(db).get_version(current_user)
+    etag = make_etag("dashboard", current_user.id, version, page, per_page, fields, columns)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    response.headers.update(cache_headers(etag))
+    return await service.list_folders_recent_applications(current_user, page, per_page, fields, columns)
 
 @folder_router.get("/{folder_id}", response_model=FolderRead)
 @limiter.limit("10/minute")
+@query_budget(5)
 async def get_folder(
     request: Request,
+    response: Response,
     folder_id: int,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(current_active_user),
 ):
     service = FolderService(db)
+    version = await SyncService(db).get_version(current_user)
+    etag = make_etag("folder", folder_id, current_user.id, version)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    response.headers.update(cache_headers(etag))
     return await service.get_folder(folder_id, current_user)
 
 @folder_router.get("/{folder_id}/applications")
 @limiter.limit("10/minute")
+@query_budget(6)
 async def get_folder_applications(
     request: Request,
     folder_id: int,
+    query: str = None,
     page: int = 1,
     per_page: int = 10,
     sort_by: str = "updated_at",
     sort_order: Literal["asc", "desc"] = "desc",
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str = None,
+    total: TotalMode = "exact",
+    fields: Projection = "full",
+    columns: str = None,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(current_active_user),
 ):
     app_service = ApplicationService(db)
-    return await app_service.search_applications(current_user, query=None, filters={"folder_id": folder_id}, page=page, per_page=per_page, sort_by=sort_by, sort_order=sort_order)
+    return await app_service.search_applications(current_user, query=query, filters={"folder_id": folder_id}, page=page, per_page=per_page, sort_by=sort_by, sort_order=sort_order, pagination=pagination, cursor=cursor, total=total, fields=fields, columns=columns)
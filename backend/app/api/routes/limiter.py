@@ -1,4 +1,59 @@
-from slowapi import Limiter
+from typing import Optional
+
+import slowapi
+from limits.strategies import FixedWindowRateLimiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from app.core.auth import jwt_strategy
+from app.core.config import settings
+from app.core.rate_limit import SharedStorage, get_counter_backend
+
+
+def rate_limit_key(request: Request) -> str:
+    """The user of a valid bearer token, so users behind one NAT get their own budgets; else the client address."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        # memoized per token, so this is usually a dictionary lookup
+        claims = jwt_strategy.read_claims(token)
+        if claims is not None:
+            return f"user:{claims[0]}"
+    return f"ip:{get_remote_address(request)}"
+
+
+class Limiter(slowapi.Limiter):
+    """slowapi Limiter whose route limits can be overridden from `settings.RATE_LIMITS`.
+
+    With a SharedStorage the counts are kept in-process and shared between workers in the background.
+    """
+
+    def __init__(self, *args, shared_storage: Optional[SharedStorage] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shared_storage = shared_storage
+        if shared_storage is not None:
+            self._storage = shared_storage
+            self._limiter = FixedWindowRateLimiter(shared_storage)
+
+    def limit(self, limit_value, *args, **kwargs):
+        def decorator(func):
+            value = settings.RATE_LIMITS.get(func.__name__, limit_value)
+            return super(Limiter, self).limit(value, *args, **kwargs)(func)
+        return decorator
+
+    async def start(self) -> None:
+        if self.shared_storage is not None:
+            await self.shared_storage.start()
+
+    async def stop(self) -> None:
+        if self.shared_storage is not None:
+            await self.shared_storage.stop()
+
 
-limiter = Limiter(key_func=get_remote_address)
+backend = get_counter_backend()
+limiter = Limiter(
+    key_func=rate_limit_key,
+    enabled=settings.RATE_LIMIT_ENABLED,
+    strategy="fixed-window",
+    storage_uri="memory://",
+    shared_storage=SharedStorage(backend, settings.RATE_LIMIT_SYNC_INTERVAL) if backend is not None else None,
+)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import require_metrics_access
+from app.core.metrics import registry
+
+metrics_router = APIRouter()
+
+
+# Prometheus text exposition format; see require_metrics_access for who may read it
+@metrics_router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(require_metrics_access)],
+)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -4,26 +4,36 @@ from app.api.deps import get_async_session
 from app.core.auth import current_active_user
 from app.db.models.user import User
 from app.services.folder import FolderService
-from app.services.application import ApplicationService
+from app.services.application import ApplicationService, Projection
 from app.api.routes.limiter import limiter
+from app.core.query_profile import query_budget
+from app.repositories.pagination import TotalMode
+from typing import Literal
 
 search_router = APIRouter()
 
 @search_router.get("/")
 @limiter.limit("10/minute")
+@query_budget(9)
 async def search(
     request: Request,
     query: str = None,
     page: int = 1,
     per_page: int = 10,
+    pagination: Literal["offset", "cursor"] = "offset",
+    folders_cursor: str = None,
+    applications_cursor: str = None,
+    total: TotalMode = "exact",
+    fields: Projection = "full",
+    columns: str = None,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(current_active_user),
 ):
     folder_service = FolderService(db)
     app_service = ApplicationService(db)
     
-    folders = await folder_service.search_folders(current_user, query, filters=None, page=page, per_page=per_page)
-    applications = await app_service.search_applications(current_user, query, filters=None, page=page, per_page=per_page)
+    folders = await folder_service.search_folders(current_user, query, filters=None, page=page, per_page=per_page, pagination=pagination, cursor=folders_cursor, total=total)
+    applications = await app_service.search_applications(current_user, query, filters=None, page=page, per_page=per_page, sort_by="relevance", pagination=pagination, cursor=applications_cursor, total=total, fields=fields, columns=columns)
     
     return {
         "folders": folders,
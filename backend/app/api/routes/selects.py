@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_async_session
+from app.api.etag import make_etag, not_modified, cache_headers
 from app.core.auth import current_active_user
 from app.db.models.user import User
 from app.schemas.selects import TagCreate, TagUpdate, TagRead, StatusCreate, StatusUpdate, StatusRead, PriorityCreate, PriorityUpdate, PriorityRead
 from app.services.selects import SelectsService
+from app.services.sync import SyncService
 from app.api.routes.limiter import limiter
 
 selects_router = APIRouter()
@@ -121,16 +123,14 @@ async def delete_priority(
 @limiter.limit("10/minute")
 async def list_all_selects(
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(current_active_user),
 ):
     service = SelectsService(db)
-    tags = await service.list_tags(current_user, page=1, per_page=100)
-    statuses = await service.list_statuses(current_user, page=1, per_page=100)
-    priorities = await service.list_priorities(current_user, page=1, per_page=100)
-    
-    return {
-        "tags": tags,
-        "statuses": statuses,
-        "priorities": priorities
-    }
+    version = await SyncService(db).get_version(current_user)
+    etag = make_etag("selects", current_user.id, version)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    response.headers.update(cache_headers(etag))
+    return await service.get_reference_data(current_user)
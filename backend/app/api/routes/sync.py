@@ -0,0 +1,59 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_session
+from app.core.auth import current_active_user
+from app.db.models.user import User
+from app.services.sync import SyncService
+from app.services.sync_changes import SyncChangesService
+from app.schemas.sync import SyncChanges
+from app.api.routes.limiter import limiter
+from app.core.query_profile import query_budget
+from app.core.events import sse_stream
+
+sync_router = APIRouter()
+
+# Poll target: clients refetch only when the version moved
+@sync_router.get("/version")
+@limiter.limit("60/minute")
+@query_budget(2)
+async def get_data_version(
+    request: Request,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_active_user),
+):
+    service = SyncService(db)
+    return {"version": await service.get_version(current_user)}
+
+
+# Delta sync: pass the returned token back as `since`; 410 means start over without it
+@sync_router.get("/changes", response_model=SyncChanges)
+@limiter.limit("60/minute")
+@query_budget(12)
+async def get_changes(
+    request: Request,
+    since: Optional[str] = Query(None, description="token from the previous response"),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_active_user),
+):
+    service = SyncChangesService(db)
+    return await service.get_changes(current_user, since)
+
+
+# Server-Sent Events: one `change` event per committed write (kind, action, id, fields, version).
+# `resync` means events were missed and the client should call /sync/changes
+@sync_router.get("/events")
+@limiter.limit("30/minute")
+async def stream_events(
+    request: Request,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_active_user),
+):
+    # the stream can stay open for hours; give back the connection the auth lookup used
+    await db.close()
+    return StreamingResponse(
+        sse_stream(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
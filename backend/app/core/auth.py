@@ -6,17 +6,31 @@ from app.core.config import settings
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_users.db import SQLAlchemyUserDatabase, SQLAlchemyBaseUserTableUUID
 
+import hashlib
+import math
+import time
 import uuid
-from typing import Optional
-from fastapi import Depends
-from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, models
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import jwt
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, exceptions, models, schemas
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy
 )
 from fastapi_users.db import SQLAlchemyUserDatabase
-from fastapi_users.password import PasswordHelper
+from fastapi_users.jwt import decode_jwt
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import UserScopedCache
+from app.core.password import async_password_helper, password_helper
+
+# active users per token id, so authenticated requests skip the users query
+user_cache = UserScopedCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
 
 
 # FastAPI Users
@@ -24,18 +38,133 @@ class UserManager(UUIDIDMixin, BaseUserManager[User , uuid.UUID]):
     reset_token_model: Optional[User] = settings.SECRET_KEY
     verify_token_model: Optional[User] = settings.SECRET_KEY
 
+    # The base class hashes inline on the event loop; these are its versions with the hashing
+    # in async_password_helper's pool
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # hash anyway, so unknown emails take as long as wrong passwords
+            await async_password_helper.hash(credentials.password)
+            return None
+
+        verified, updated_password_hash = await async_password_helper.verify_and_update(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        # a hash made with other costs is replaced with one made with the current ones
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+        return user
+
+    async def create(self, user_create: schemas.UC, safe: bool = False, request: Optional[Request] = None) -> User:
+        await self.validate_password(user_create.password, user_create)
+        if await self.user_db.get_by_email(user_create.email) is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = user_create.create_update_dict() if safe else user_create.create_update_dict_superuser()
+        user_dict["hashed_password"] = await async_password_helper.hash(user_dict.pop("password"))
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def _update(self, user: User, update_dict: Dict[str, Any]) -> User:
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            # hashed here, so the base class only stores it
+            update_dict = {key: value for key, value in update_dict.items() if key != "password"}
+            update_dict["hashed_password"] = await async_password_helper.hash(password)
+        return await super()._update(user, update_dict)
+
+    # Anything that can change who a token authenticates drops the user's cached entries
+    async def on_after_update(self, user: User, update_dict: Dict[str, Any], request: Optional[Request] = None) -> None:
+        user_cache.invalidate(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None) -> None:
+        user_cache.invalidate(user.id)
+
+    async def on_after_verify(self, user: User, request: Optional[Request] = None) -> None:
+        user_cache.invalidate(user.id)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None) -> None:
+        user_cache.invalidate(user.id)
+
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
     yield SQLAlchemyUserDatabase(session, User)
 
 async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_helper)
 
 
 # JWT
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 
+class CachedJWTStrategy(JWTStrategy[User, uuid.UUID]):
+    """JWTStrategy that memoizes verified claims per token and the active user per token id.
+
+    A cached user is handed out as a fresh detached copy, so every request's session can
+    attach its own instance.
+    """
+
+    def __init__(self, *args, maxsize: int = 10_000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.maxsize = maxsize
+        # token -> (sub, expiry as a unix timestamp)
+        self._claims: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+
+    def read_claims(self, token: str) -> Optional[Tuple[str, float]]:
+        claims = self._claims.get(token)
+        if claims is not None:
+            if claims[1] > time.time():
+                self._claims.move_to_end(token)
+                return claims
+            del self._claims[token]
+            return None
+        try:
+            data = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+        except jwt.PyJWTError:
+            return None
+        if data.get("sub") is None:
+            return None
+        claims = (data["sub"], data.get("exp", math.inf))
+        self._claims[token] = claims
+        while len(self._claims) > self.maxsize:
+            self._claims.popitem(last=False)
+        return claims
+
+    async def read_token(self, token: Optional[str], user_manager: BaseUserManager[User, uuid.UUID]) -> Optional[User]:
+        if token is None:
+            return None
+        claims = self.read_claims(token)
+        if claims is None:
+            return None
+        try:
+            user_id = user_manager.parse_id(claims[0])
+        except exceptions.InvalidID:
+            return None
+
+        token_id = hashlib.sha256(token.encode()).digest()
+        values = user_cache.get(user_id, token_id)
+        if values is not None:
+            user = User(**values)
+            make_transient_to_detached(user)
+            return user
+
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+        if user.is_active:
+            user_cache.set(user_id, token_id, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+        return user
+
+
+jwt_strategy = CachedJWTStrategy(secret=settings.SECRET_KEY, lifetime_seconds=3600, maxsize=settings.AUTH_CACHE_SIZE)
+
 def get_jwt_strategy():
-    return JWTStrategy(secret=settings.SECRET_KEY, lifetime_seconds=3600)
+    return jwt_strategy
 
 auth_backend = AuthenticationBackend(
     name="jwt",
@@ -46,8 +175,6 @@ auth_backend = AuthenticationBackend(
 fastapi_users = FastAPIUsers[User, uuid.UUID](get_user_manager, [auth_backend])
 current_active_user = fastapi_users.current_user(active=True)
 
-# Password Helper
-password_helper = PasswordHelper()
-
+# Password Helper; synchronous, for scripts
 def get_password_hash(password: str) -> str:
     return password_helper.hash(password)
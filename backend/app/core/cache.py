@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import json
+import time
+import uuid
+
+from app.core.config import settings
+
+
+class UserScopedCache:
+    """Bounded in-process LRU cache whose entries are scoped to a user.
+
+    Each user has a generation number baked into the keys; invalidating a user bumps it,
+    so their stale entries are never read again and simply age out of the LRU.
+    With a `ttl` (seconds), entries also expire on their own.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._generations: Dict[uuid.UUID, int] = {}
+
+    def _key(self, user_id: uuid.UUID, key: Hashable) -> tuple:
+        return user_id, self._generations.get(user_id, 0), key
+
+    def get(self, user_id: uuid.UUID, key: Hashable) -> Optional[Any]:
+        full_key = self._key(user_id, key)
+        if full_key not in self._entries:
+            return None
+        expires_at, value = self._entries[full_key]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[full_key]
+            return None
+        self._entries.move_to_end(full_key)
+        return value
+
+    def set(self, user_id: uuid.UUID, key: Hashable, value: Any) -> None:
+        full_key = self._key(user_id, key)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[full_key] = (expires_at, value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+
+# Backends
+class CacheBackend:
+    """Shared key/value store behind the versioned caches. Values are strings."""
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Process-local backend; every worker keeps its own copy."""
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._values: OrderedDict = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        if key not in self._values:
+            return None
+        expires_at, value = self._values[key]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._values[key] = (expires_at, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis protocol backend (Redis, Valkey, KeyDB, ...) shared by every worker."""
+
+    def __init__(self, url: str):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        self._client = Redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+
+def get_cache_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    return MemoryCacheBackend()
+
+
+class VersionedCache:
+    """Per-user JSON values in a shared backend, fronted by an in-process LRU.
+
+    Values are stored under (user, data version), the user_data_versions counter every
+    write bumps in its own transaction. A write is only visible together with its new
+    version, so no worker reads a value from before it and nothing needs invalidating.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend, maxsize: int = 1024, ttl: Optional[int] = None):
+        self.namespace = namespace
+        self.backend = backend
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local: OrderedDict = OrderedDict()
+
+    async def get(
+        self, user_id: uuid.UUID, version: int, loader: Callable[[], Awaitable[Any]], refresh: bool = False
+    ) -> Any:
+        """The value for `version`, from `loader` on a miss or when `refresh` is set."""
+        local_key = (user_id, version)
+        if not refresh and local_key in self._local:
+            self._local.move_to_end(local_key)
+            return self._local[local_key]
+
+        value_key = f"{self.namespace}:{user_id}:{version}"
+        cached = None if refresh else await self.backend.get(value_key)
+        if cached is not None:
+            value = json.loads(cached)
+        else:
+            value = await loader()
+            await self.backend.set(value_key, json.dumps(value), ttl=self.ttl)
+
+        self._local[local_key] = value
+        self._local.move_to_end(local_key)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+        return value
+
+
+# listing totals for total="cached", per user data version (see count_total)
+count_cache = UserScopedCache(maxsize=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL)
+
+cache_backend = get_cache_backend()
+
+# tags, statuses and priorities per user data version
+selects_cache = VersionedCache(
+    "selects", cache_backend, maxsize=settings.SELECTS_CACHE_SIZE, ttl=settings.SELECTS_CACHE_TTL
+)
@@ -43,13 +43,109 @@ class Settings(BaseSettings):
     # Production
     DATABASE_URL: str = ""
 
+    # Database connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+    # Connections opened during startup so the first requests don't pay for connecting
+    DB_POOL_WARMUP: int = 2
+    # asyncpg prepared statement cache, per connection
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Extra Postgres session settings, e.g. {"statement_timeout": "5000"}
+    DB_SERVER_SETTINGS: dict[str, str] = {}
+    # Behind PgBouncer in transaction mode: no prepared statement reuse across transactions
+    DB_PGBOUNCER: bool = False
+
     # Logging
     LOGGING_LEVEL: str = "INFO"
+    # empty disables the file; rotated by size (LOGGING_MAX_BYTES) or time (LOGGING_ROTATE_WHEN)
     LOGGING_FILE: str = "app.log"
+    LOGGING_ROTATION: Literal["size", "time"] = "size"
+    LOGGING_MAX_BYTES: int = 10 * 1024 * 1024
+    LOGGING_ROTATE_WHEN: str = "midnight"
+    LOGGING_BACKUP_COUNT: int = 5
+    LOGGING_STDOUT: bool = True
+
+    # Request logging: slow requests and server errors are always logged,
+    # other requests with probability LOG_SAMPLE_RATE
+    LOG_SLOW_REQUEST_MS: float = 500
+    LOG_SAMPLE_RATE: float = 1.0
+
+    # Query profiling (local and test only): a statement shape repeated this often in
+    # one request is reported as a likely N+1
+    QUERY_REPEAT_THRESHOLD: int = 3
 
     # API
     API_PREFIX: str = ""
 
+    # GET /metrics (Prometheus) is open in local only, unless this is set: then scrapers must
+    # send it as `Authorization: Bearer <token>`, in every environment
+    METRICS_TOKEN: str | None = None
+
+    # Folder status counts: "aggregate" groups applications on read, "summary" reads the
+    # trigger-maintained folder_status_counts table. The trigger only exists in summary mode:
+    # run `app/scripts/folder_status_counts.py enable` before switching to it, and `disable`
+    # after switching back (the app refuses to start in summary mode without it)
+    FOLDER_STATUS_COUNTS: Literal["aggregate", "summary"] = "aggregate"
+
+    # Bulk import
+    BULK_IMPORT_CHUNK_SIZE: int = 500
+    BULK_IMPORT_MAX_ROWS: int = 50_000
+
+    # Export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # PATCH /applications/batch and /folders/batch
+    BATCH_UPDATE_MAX_ITEMS: int = 500
+
+    # Ordering keys longer than this get the user's items renumbered in the background
+    RANK_REBALANCE_LENGTH: int = 24
+
+    # Password hashing (argon2id). Changing the costs rehashes each password at its next login
+    PASSWORD_HASH_TIME_COST: int = 3
+    PASSWORD_HASH_MEMORY_COST: int = 65536
+    PASSWORD_HASH_PARALLELISM: int = 4
+    # Hashing runs in this pool, off the event loop
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Caching
+    # total=cached listing counts, per user data version. The TTL bounds staleness after writes
+    # that bypass the API (scripts, manual SQL), which do not bump the version
+    COUNT_CACHE_SIZE: int = 10_000
+    COUNT_CACHE_TTL: int = 5 * 60
+    # Authenticated users per token, so requests skip the users query. Updates, deactivation and
+    # password changes drop a user's entries in the worker that handles them; other workers
+    # notice within the TTL
+    AUTH_USER_CACHE_TTL: int = 30
+    AUTH_CACHE_SIZE: int = 10_000
+    CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    SELECTS_CACHE_SIZE: int = 1024
+    SELECTS_CACHE_TTL: int = 60 * 60
+
+    # Delta sync: deletes older than this are forgotten, and older tokens must resync from scratch
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Change events (GET /sync/events); postgres fans out between workers with LISTEN/NOTIFY
+    EVENTS_BACKEND: Literal["memory", "postgres"] = "memory"
+    # LISTEN needs a session-level connection: point this past PgBouncer in transaction mode
+    EVENTS_DATABASE_URL: str | None = None
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+
+    # Rate limiting, per user when the request has a valid token, else per client address.
+    # "memory" counts per worker; redis and postgres share the counts between workers, pushed
+    # every RATE_LIMIT_SYNC_INTERVAL seconds so a check never waits on the network
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE: Literal["memory", "redis", "postgres"] = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_SYNC_INTERVAL: float = 1.0
+    # Overrides by endpoint function name, e.g. {"update_application": "20/minute"}
+    RATE_LIMITS: dict[str, str] = {}
+
     # FastAPI host/port for dev (ignored in production)
     LOCAL_API_DOMAIN: str = "0.0.0.0"
     LOCAL_API_PORT: int = 5000
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.logging import logger
+
+# NOTIFY payloads must stay below 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+
+# Sent when events may have been lost (slow client, dropped LISTEN connection): refetch instead
+RESYNC_EVENT = {"kind": "resync"}
+
+# payload -> subscribers; None means events may have been missed
+Deliver = Callable[[Optional[str]], None]
+
+
+# Backends
+class EventBackend:
+    """Carries serialized events to every worker, including the one that published them."""
+
+    async def start(self, deliver: Deliver) -> None:
+        raise NotImplementedError
+
+    async def publish(self, payload: str) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+
+class MemoryEventBackend(EventBackend):
+    """Process-local backend; only clients connected to the same worker see the events."""
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, payload: str) -> None:
+        self._deliver(payload)
+
+
+class PostgresEventBackend(EventBackend):
+    """LISTEN/NOTIFY on one dedicated connection per worker, outside the SQLAlchemy pool."""
+
+    def __init__(self, url: str, channel: str = "trax_events"):
+        # asyncpg wants a plain postgresql:// DSN
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._connection = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        # an asyncpg connection runs one statement at a time
+        self._lock = asyncio.Lock()
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        try:
+            await self._connect()
+        except Exception as e:
+            # Not fatal: requests still work, clients just don't get pushed events until it connects
+            logger.warning(f"Could not listen for change events: {e!r}")
+            self._schedule_reconnect()
+
+    async def _connect(self) -> None:
+        import asyncpg
+        connection = await asyncpg.connect(self.dsn)
+        await connection.add_listener(self.channel, self._on_notify)
+        connection.add_termination_listener(self._on_terminate)
+        self._connection = connection
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._deliver(payload)
+
+    def _on_terminate(self, connection) -> None:
+        self._connection = None
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1.0
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.warning(f"Could not listen for change events: {e!r}")
+                delay = min(delay * 2, 30.0)
+                continue
+            # whatever was sent while disconnected is gone
+            self._deliver(None)
+            return
+
+    async def publish(self, payload: str) -> None:
+        if self._connection is None:
+            raise ConnectionError("Not connected for change events")
+        async with self._lock:
+            await self._connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+    async def stop(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            connection.remove_termination_listener(self._on_terminate)
+            await connection.close()
+
+
+def get_event_backend() -> EventBackend:
+    if settings.EVENTS_BACKEND == "postgres":
+        return PostgresEventBackend(settings.EVENTS_DATABASE_URL or settings.DATABASE_URL)
+    return MemoryEventBackend()
+
+
+class EventBroker:
+    """Fans per-user change events out to this worker's subscribers; the backend links the workers."""
+
+    def __init__(self, backend: EventBackend, queue_size: int = 100):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: Dict[uuid.UUID, Set[asyncio.Queue]] = {}
+
+    async def start(self) -> None:
+        await self.backend.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    async def publish(self, user_id: uuid.UUID, event: Dict[str, Any]) -> None:
+        """Best effort: the change is already committed, so a failure is only logged."""
+        payload = json.dumps({"user_id": str(user_id), "event": event}, default=str)
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            # field and id lists are hints: clients can always fall back to /sync/changes
+            event = {key: value for key, value in event.items() if key not in ("fields", "ids")}
+            payload = json.dumps({"user_id": str(user_id), "event": event}, default=str)
+        try:
+            await self.backend.publish(payload)
+        except Exception as e:
+            logger.warning(f"Could not publish change event: {e!r}")
+
+    def _deliver(self, payload: Optional[str]) -> None:
+        if payload is None:
+            for queues in self._subscribers.values():
+                for queue in queues:
+                    self._put(queue, RESYNC_EVENT)
+            return
+        message = json.loads(payload)
+        for queue in self._subscribers.get(uuid.UUID(message["user_id"]), ()):
+            self._put(queue, message["event"])
+
+    def _put(self, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # a client that can't keep up gets a single resync instead of an unbounded backlog
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_EVENT)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: uuid.UUID) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id, set())
+            queues.discard(queue)
+            if not queues:
+                self._subscribers.pop(user_id, None)
+
+
+async def sse_stream(user_id: uuid.UUID) -> AsyncIterator[str]:
+    """The user's change events as Server-Sent Events, with comment lines as keep-alives."""
+    async with broker.subscribe(user_id) as queue:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                continue
+            name = "resync" if event.get("kind") == "resync" else "change"
+            yield f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+broker = EventBroker(get_event_backend(), queue_size=settings.EVENTS_QUEUE_SIZE)
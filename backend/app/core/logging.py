@@ -1,25 +1,62 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+from datetime import datetime, timezone
 from app.core.config import settings
 
 
 logger = logging.getLogger() # root logger
-LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 
-formatter = logging.Formatter(
-    fmt=LOG_FORMAT
-)
+# Attributes every LogRecord has; anything else was passed through `extra`
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
 
-#handlers
-# stream_handler = logging.StreamHandler(stream=sys.stdout)
-file_handler = logging.FileHandler(filename=settings.LOGGING_FILE)
 
-# set the formats
-# stream_handler.setFormatter(formatter)
-file_handler.setFormatter(formatter)
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and any `extra` fields."""
 
-# add handlers to the root logger
-# logger.addHandler(stream_handler)
-logger.addHandler(file_handler)
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES})
+        return json.dumps(entry, default=str)
 
-logger.setLevel(settings.LOGGING_LEVEL)
\ No newline at end of file
+
+def build_handlers() -> list[logging.Handler]:
+    handlers: list[logging.Handler] = []
+    if settings.LOGGING_FILE:
+        if settings.LOGGING_ROTATION == "time":
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                filename=settings.LOGGING_FILE, when=settings.LOGGING_ROTATE_WHEN, backupCount=settings.LOGGING_BACKUP_COUNT
+            )
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                filename=settings.LOGGING_FILE, maxBytes=settings.LOGGING_MAX_BYTES, backupCount=settings.LOGGING_BACKUP_COUNT
+            )
+        handlers.append(file_handler)
+    if settings.LOGGING_STDOUT:
+        # Cloud Run picks up JSON lines on stdout as structured logs
+        handlers.append(logging.StreamHandler(stream=sys.stdout))
+
+    formatter = JsonFormatter()
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+# The event loop only puts records on a queue; a background thread does the formatting and I/O
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+listener = logging.handlers.QueueListener(log_queue, *build_handlers(), respect_handler_level=True)
+
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.setLevel(settings.LOGGING_LEVEL)
+
+listener.start()
+# flushes whatever is still queued on shutdown
+atexit.register(listener.stop)
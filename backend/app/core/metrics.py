@@ -0,0 +1,133 @@
+import math
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Counter as TypingCounter, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; tuned for database and request latencies
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Dict[str, str] | None = None) -> str:
+    pairs = list(zip(names, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> ([count per bucket], sum, count)
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            counts, totals = self._series.setdefault(tuple(labelvalues), ([0] * len(self.buckets), [0.0, 0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), list(totals)) for labels, (counts, totals) in self._series.items()}
+        for labels, (counts, (total, count)) in sorted(series.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                bucket_labels = _format_labels(self.labelnames, labels, {"le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, {'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Gauge:
+    """Gauge that is either set directly or read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, callback: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def collect(self) -> List[str]:
+        value = self.callback() if self.callback is not None else self.value
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_value(value)}",
+        ]
+
+
+@dataclass
+class RequestStats:
+    """SQL work done while serving the current request."""
+    queries: int = 0
+    query_seconds: float = 0.0
+    # statement fingerprint -> executions; only collected when query profiling is on
+    statements: Optional[TypingCounter[str]] = None
+
+
+# Set by MetricsMiddleware; the database event hooks add to it (None outside a request)
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Histogram | Gauge] = {}
+
+    def register(self, metric):
+        # Re-registering replaces the metric, so module reloads don't duplicate series
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Request latency", ("method", "route", "status"),
+))
+http_requests_in_flight = registry.register(Gauge("http_requests_in_flight", "Requests currently being served"))
+http_request_db_queries = registry.register(Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+))
+http_request_db_duration = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL statements per request", ("method", "route"),
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement latency", ("operation",),
+))
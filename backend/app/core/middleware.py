@@ -1,24 +1,145 @@
-from fastapi import Request
+import random
+from collections import Counter
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import (
+    RequestStats, request_stats, http_request_duration, http_requests_in_flight,
+    http_request_db_queries, http_request_db_duration,
+)
+from app.core.query_profile import QueryBudgetExceeded, get_query_budget
 import time
 
 
-# on every request
-async def log_middleware(
-        request: Request,
-        call_next
-):
-    start = time.time(
-
-    )
-    response = await call_next(request)
-    # await asyncio.sleep(3)
-    process_time = time.time() - start
-    log_dict = {
-        "url": request.url.path,
-        "method": request.method,
-        "process_time": process_time,
-    }
-    logger.info(log_dict, extra=log_dict) # extracting to top level keys
-
-    return response
\ No newline at end of file
+class LoggingMiddleware:
+    """Logs one structured line per request.
+
+    Slow requests and server errors are always logged; the rest are sampled at LOG_SAMPLE_RATE.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration_ms = (time.perf_counter_ns() - start) / 1_000_000
+            if status >= 500 or duration_ms >= settings.LOG_SLOW_REQUEST_MS or random.random() < settings.LOG_SAMPLE_RATE:
+                stats = request_stats.get()
+                route = scope.get("route")
+                log_dict = {
+                    "url": scope["path"],
+                    "route": getattr(route, "path_format", None),
+                    "method": scope["method"],
+                    "status": status,
+                    "duration_ms": round(duration_ms, 3),
+                    "db_queries": stats.queries if stats is not None else None,
+                }
+                logger.info("request", extra=log_dict) # extracting to top level keys
+
+
+class MetricsMiddleware:
+    """Records latency, status and SQL work per request, labelled by route template.
+
+    Plain ASGI, so the request's context (and the SQL stats in it) is shared with the endpoint.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            request_stats.reset(token)
+
+            # The router stores the matched route in the scope; raw paths would explode the label set
+            route = scope.get("route")
+            route_path = getattr(route, "path_format", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration.observe(elapsed, method, route_path, str(status))
+            http_request_db_queries.observe(stats.queries, method, route_path)
+            http_request_db_duration.observe(stats.query_seconds, method, route_path)
+
+
+class QueryProfileMiddleware:
+    """Fingerprints each request's SQL, reports repeated statements and enforces `@query_budget`.
+
+    Must run inside MetricsMiddleware, which sets up the request stats. Locally the profile
+    is returned in an X-SQL-Profile header; in the test environment a blown budget raises.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = request_stats.get()
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+        stats.statements = Counter()
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.ENVIRONMENT == "local":
+                budget = get_query_budget(getattr(scope.get("route"), "endpoint", None))
+                profile = f"queries={stats.queries}; duration_ms={stats.query_seconds * 1000:.2f}; repeated={len(self._repeated(stats))}"
+                if budget is not None:
+                    profile += f"; budget={budget}"
+                MutableHeaders(scope=message).append("X-SQL-Profile", profile)
+            await send(message)
+
+        await self.app(scope, receive, send_with_profile)
+
+        route = scope.get("route")
+        route_path = getattr(route, "path_format", None) or scope["path"]
+        for statement, count in self._repeated(stats).items():
+            logger.warning(
+                f"Possible N+1 on {scope['method']} {route_path}: statement ran {count} times",
+                extra={"route": route_path, "executions": count, "statement": statement},
+            )
+
+        budget = get_query_budget(getattr(route, "endpoint", None))
+        if budget is not None and stats.queries > budget:
+            message = f"{scope['method']} {route_path} ran {stats.queries} SQL statements, over its budget of {budget}"
+            if settings.ENVIRONMENT == "test":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message, extra={"route": route_path, "queries": stats.queries, "budget": budget})
+
+    def _repeated(self, stats: RequestStats) -> dict:
+        return {
+            statement: count for statement, count in stats.statements.items()
+            if count >= settings.QUERY_REPEAT_THRESHOLD
+        }
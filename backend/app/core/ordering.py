@@ -0,0 +1,139 @@
+from typing import List, Optional
+
+# Fractional ordering keys (the "fractional-indexing" scheme): an integer part whose first
+# character encodes its length (a-z positive, A-Z negative), then an optional base-62
+# fraction without trailing zeros. Keys compare as plain strings, so the database column
+# needs byte-order (COLLATE "C") comparison. Appending increments the integer part, so
+# keys only grow when items are squeezed between close neighbours.
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+INTEGER_ZERO = "a0"
+SMALLEST_INTEGER = "A" + DIGITS[0] * 26
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"Invalid ordering key head {head!r}")
+
+
+def _split(key: str) -> tuple[str, str]:
+    """(integer part, fraction) of a key, validating it."""
+    if not key or any(char not in DIGITS for char in key):
+        raise ValueError(f"Invalid ordering key {key!r}")
+    length = _integer_length(key[0])
+    if length > len(key) or key == SMALLEST_INTEGER or key[length:].endswith(DIGITS[0]):
+        raise ValueError(f"Invalid ordering key {key!r}")
+    return key[:length], key[length:]
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """A fraction strictly between `a` ("" is zero) and `b` (None is one)."""
+    if b is not None:
+        # skip the common prefix; `a` is padded with zero digits
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    # consecutive first digits
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _increment(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) + 1
+        if value < BASE:
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = DIGITS[0]
+    # every digit carried over: move to the next length
+    if head == "Z":
+        return INTEGER_ZERO
+    if head == "z":
+        return None
+    next_head = chr(ord(head) + 1)
+    if next_head > "a":
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return next_head + "".join(digits)
+
+
+def _decrement(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) - 1
+        if value >= 0:
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    previous_head = chr(ord(head) - 1)
+    if previous_head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return previous_head + "".join(digits)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """A key after `a` and before `b`; None means the start or end of the list."""
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"{a!r} is not before {b!r}")
+    if a is None and b is None:
+        return INTEGER_ZERO
+    if a is None:
+        integer_b, fraction_b = _split(b)
+        if integer_b == SMALLEST_INTEGER:
+            return integer_b + _midpoint("", fraction_b)
+        if fraction_b:
+            return integer_b
+        key = _decrement(integer_b)
+        if key is None:
+            raise ValueError("Cannot order before the smallest key")
+        return key
+    integer_a, fraction_a = _split(a)
+    if b is None:
+        key = _increment(integer_a)
+        return key if key is not None else integer_a + _midpoint(fraction_a, None)
+    integer_b, fraction_b = _split(b)
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    key = _increment(integer_a)
+    if key is None:
+        raise ValueError("Cannot order after the largest key")
+    return key if key < b else integer_a + _midpoint(fraction_a, None)
+
+
+def keys_between(a: Optional[str], b: Optional[str], n: int) -> List[str]:
+    """`n` ascending keys between `a` and `b`, kept as short as possible."""
+    if n <= 0:
+        return []
+    if b is None:
+        keys = []
+        for _ in range(n):
+            a = key_between(a, None)
+            keys.append(a)
+        return keys
+    if a is None:
+        keys = []
+        for _ in range(n):
+            b = key_between(None, b)
+            keys.append(b)
+        return keys[::-1]
+    middle = key_between(a, b)
+    half = (n - 1) // 2
+    return keys_between(a, middle, half) + [middle] + keys_between(middle, b, n - 1 - half)
@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from app.core.config import settings
+
+
+def build_password_helper() -> PasswordHelper:
+    """Argon2id with the configured costs.
+
+    Hashes made with other costs, or with bcrypt, still verify and are rehashed at the next login.
+    """
+    return PasswordHelper(PasswordHash((
+        Argon2Hasher(
+            time_cost=settings.PASSWORD_HASH_TIME_COST,
+            memory_cost=settings.PASSWORD_HASH_MEMORY_COST,
+            parallelism=settings.PASSWORD_HASH_PARALLELISM,
+        ),
+        BcryptHasher(),
+    )))
+
+
+# built again in every process of a process pool, which import this module
+password_helper = build_password_helper()
+
+
+def _hash(password: str) -> str:
+    return password_helper.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return password_helper.verify_and_update(plain_password, hashed_password)
+
+
+class AsyncPasswordHelper:
+    """The PasswordHelper calls, run in a bounded pool so a burst of logins never blocks the event loop.
+
+    argon2 and bcrypt release the GIL, so threads hash in parallel; a process pool also keeps
+    the hashing off the worker's CPU share.
+    """
+
+    def __init__(self, executor: Executor):
+        self.executor = executor
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(verified, new hash when the stored one used other costs or another algorithm)."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, _verify_and_update, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_password_executor() -> Executor:
+    if settings.PASSWORD_HASH_EXECUTOR == "process":
+        return ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+async_password_helper = AsyncPasswordHelper(get_password_executor())
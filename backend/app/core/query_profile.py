@@ -0,0 +1,43 @@
+import re
+from typing import Callable, Optional, TypeVar
+
+Endpoint = TypeVar("Endpoint", bound=Callable)
+
+QUERY_BUDGET_ATTRIBUTE = "__query_budget__"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in the test environment when a route runs more statements than its budget."""
+
+
+def query_budget(max_queries: int) -> Callable[[Endpoint], Endpoint]:
+    """Declares the most SQL statements a route may run per request.
+
+    Checked by QueryProfileMiddleware outside production: a warning locally, a failure in tests.
+    """
+    def decorator(endpoint: Endpoint) -> Endpoint:
+        setattr(endpoint, QUERY_BUDGET_ATTRIBUTE, max_queries)
+        return endpoint
+    return decorator
+
+
+def get_query_budget(endpoint: Optional[Callable]) -> Optional[int]:
+    return getattr(endpoint, QUERY_BUDGET_ATTRIBUTE, None)
+
+
+def fingerprint(statement: str) -> str:
+    """The statement with literals and parameters replaced, so the same query shape compares equal.
+
+    IN lists of any length collapse to one placeholder, which catches loops that batch differently.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
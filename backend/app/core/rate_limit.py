@@ -0,0 +1,201 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+from limits.storage import Storage
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.logging import logger
+
+# keys per INSERT when pushing to Postgres, well below the bind parameter limit
+PUSH_CHUNK_SIZE = 1000
+# seconds between deletes of expired Postgres counters
+PRUNE_INTERVAL = 60.0
+
+# key -> (hits, window length in seconds)
+Hits = Dict[str, Tuple[int, int]]
+# key -> (hits in the current window from every worker, window end as a unix timestamp)
+Totals = Dict[str, Tuple[int, float]]
+
+
+# Backends
+class CounterBackend:
+    """Adds this worker's hits to fixed-window counters shared by every worker."""
+
+    async def push(self, hits: Hits) -> Totals:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisCounterBackend(CounterBackend):
+    """Redis protocol counters (Redis, Valkey, KeyDB, ...), one pipeline per push."""
+
+    def __init__(self, url: str):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_STORAGE=redis requires the 'redis' package") from e
+        self._client = Redis.from_url(url)
+
+    async def push(self, hits: Hits) -> Totals:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, (amount, expiry) in hits.items():
+                # the first hit of a window creates the key with its expiry
+                pipe.set(key, 0, ex=expiry, nx=True)
+                pipe.incrby(key, amount)
+                pipe.pttl(key)
+            results = await pipe.execute()
+        now = time.time()
+        return {
+            key: (results[3 * i + 1], now + max(results[3 * i + 2], 0) / 1000)
+            for i, key in enumerate(hits)
+        }
+
+    async def stop(self) -> None:
+        await self._client.aclose()
+
+
+class PostgresCounterBackend(CounterBackend):
+    """Counters in the unlogged rate_limit_counters table, one upsert per push."""
+
+    def __init__(self):
+        self._pruned_at = 0.0
+
+    async def push(self, hits: Hits) -> Totals:
+        from app.db.models.rate_limit import RateLimitCounter
+        from app.db.session import engine
+
+        totals: Totals = {}
+        keys = list(hits)
+        async with engine.begin() as conn:
+            for start in range(0, len(keys), PUSH_CHUNK_SIZE):
+                statement = insert(RateLimitCounter).values([
+                    {"key": key, "count": hits[key][0], "expires_at": func.now() + timedelta(seconds=hits[key][1])}
+                    for key in keys[start:start + PUSH_CHUNK_SIZE]
+                ])
+                expired = RateLimitCounter.expires_at <= func.now()
+                statement = statement.on_conflict_do_update(
+                    index_elements=[RateLimitCounter.key],
+                    set_={
+                        "count": case((expired, statement.excluded.count), else_=RateLimitCounter.count + statement.excluded.count),
+                        "expires_at": case((expired, statement.excluded.expires_at), else_=RateLimitCounter.expires_at),
+                    },
+                ).returning(RateLimitCounter.key, RateLimitCounter.count, func.extract("epoch", RateLimitCounter.expires_at))
+                for key, count, expires_at in (await conn.execute(statement)).all():
+                    totals[key] = (count, float(expires_at))
+
+            if time.monotonic() - self._pruned_at > PRUNE_INTERVAL:
+                await conn.execute(delete(RateLimitCounter).where(RateLimitCounter.expires_at < func.now()))
+                self._pruned_at = time.monotonic()
+        return totals
+
+
+def get_counter_backend() -> Optional[CounterBackend]:
+    """None for RATE_LIMIT_STORAGE=memory, where slowapi's own storage is enough."""
+    if settings.RATE_LIMIT_STORAGE == "redis":
+        return RedisCounterBackend(settings.RATE_LIMIT_REDIS_URL)
+    if settings.RATE_LIMIT_STORAGE == "postgres":
+        return PostgresCounterBackend()
+    return None
+
+
+class SharedStorage(Storage):
+    """limits storage that checks against local counts and shares them through a CounterBackend.
+
+    A hit is added to the totals the backend returned at the last push, so a check never waits
+    on the network. This worker's hits are pushed every `interval` seconds; across workers a
+    limit can be overshot by about one interval's worth of hits. Supports the fixed-window
+    strategy only.
+    """
+
+    def __init__(self, backend: CounterBackend, interval: float = 1.0):
+        super().__init__()
+        self.backend = backend
+        self.interval = interval
+        # every worker's hits as of the last push, and this worker's hits since
+        self._totals: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._expiries: Dict[str, int] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def base_exceptions(self):
+        return Exception
+
+    def _current(self, key: str) -> bool:
+        if self._expires_at.get(key, 0) > time.time():
+            return True
+        self.clear(key)
+        return False
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        if not self._current(key):
+            self._expires_at[key] = time.time() + expiry
+        self._expiries[key] = expiry
+        self._pending[key] = self._pending.get(key, 0) + amount
+        return self._totals.get(key, 0) + self._pending[key]
+
+    def get(self, key: str) -> int:
+        if not self._current(key):
+            return 0
+        return self._totals.get(key, 0) + self._pending.get(key, 0)
+
+    def get_expiry(self, key: str) -> float:
+        return self._expires_at.get(key, time.time())
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> Optional[int]:
+        count = len(self._expires_at)
+        for entries in (self._totals, self._pending, self._expiries, self._expires_at):
+            entries.clear()
+        return count
+
+    def clear(self, key: str) -> None:
+        for entries in (self._totals, self._pending, self._expiries, self._expires_at):
+            entries.pop(key, None)
+
+    async def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.push()
+        await self.backend.stop()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.push()
+
+    async def push(self) -> None:
+        """Sends the hits since the last push and takes every worker's totals back."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            totals = await self.backend.push({key: (amount, self._expiries[key]) for key, amount in pending.items()})
+        except Exception as e:
+            # Not fatal: limits are enforced per worker until the backend is back
+            logger.warning(f"Could not share rate limit counts: {e!r}")
+            for key, amount in pending.items():
+                if key in self._expires_at:
+                    self._pending[key] = self._pending.get(key, 0) + amount
+            return
+        for key, (count, expires_at) in totals.items():
+            # hits that arrived during the push stay pending on top of the new total
+            self._totals[key] = count
+            self._expires_at[key] = expires_at
+        # forget windows that ended without further hits
+        now = time.time()
+        for key in [key for key, expires_at in self._expires_at.items() if expires_at <= now]:
+            self.clear(key)
@@ -0,0 +1,39 @@
+import json
+from typing import Any, Dict, Iterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` wrapper that keeps the wrapped statement's bind parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable, analyze: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    options = "ANALYZE, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.statement, **kw)
+
+
+async def explain(session: AsyncSession, statement: Executable, analyze: bool = False) -> Dict[str, Any]:
+    """Returns the top plan node of `statement`."""
+    plan = (await session.execute(Explain(statement, analyze))).scalar_one()
+    # asyncpg hands json columns back as text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def iter_plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Walks a plan node and all of its children, depth first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
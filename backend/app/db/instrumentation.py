@@ -0,0 +1,41 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import db_query_duration, request_stats
+from app.core.query_profile import fingerprint
+
+# Anything else is reported as OTHER, to keep the label set small
+OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "EXPLAIN"}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    words = statement.lstrip(" \n(").split(None, 1)
+    operation = words[0].upper() if words and words[0].upper() in OPERATIONS else "OTHER"
+    db_query_duration.observe(elapsed, operation)
+
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+        if stats.statements is not None:
+            stats.statements[fingerprint(statement)] += 1
+
+
+def _handle_error(context):
+    # after_cursor_execute doesn't run for failed statements
+    if context.connection is not None and context.connection.info.get("query_start_time"):
+        context.connection.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Times every statement and attributes it to the request being served, if any."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
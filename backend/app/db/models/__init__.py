@@ -1,4 +1,6 @@
 from .user import User
 from .selects import Tag, Status, Priority
 from .application import Application
-from .folder import Folder
+from .folder import Folder, FolderStatusCount
+from .sync import UserDataVersion, SyncTombstone
+from .rate_limit import RateLimitCounter
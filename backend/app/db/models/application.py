@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, ForeignKey, Table, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, ForeignKey, Table, Text, JSON, Computed, Index, DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db.base import Base
 from fastapi_users_db_sqlalchemy import GUID
@@ -9,12 +10,33 @@ from fastapi_users_db_sqlalchemy import GUID
 application_tags = Table(
     'application_tags',
     Base.metadata,
-    Column('application_id', Integer, ForeignKey('applications.id', ondelete="CASCADE")),
-    Column('tag_id', Integer, ForeignKey('tags.id', ondelete="CASCADE"))
+    Column('application_id', Integer, ForeignKey('applications.id', ondelete="CASCADE"), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete="CASCADE"), primary_key=True),
+    # the primary key covers application -> tags, this covers tag -> applications
+    Index("ix_application_tags_tag_id_application_id", "tag_id", "application_id"),
+)
+
+# Weighted full-text document: title/company (A) > role (B) > description/notes (C)
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(company, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(role, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(notes, '')), 'C')"
 )
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_applications_company_trgm", "company",
+            postgresql_using="gin", postgresql_ops={"company": "gin_trgm_ops"},
+        ),
+        # Per-user access paths: default listing order, status filters and counts
+        Index("ix_applications_creator_id_updated_at", "creator_id", "updated_at", "id"),
+        Index("ix_applications_creator_id_status_id", "creator_id", "status_id"),
+        # sort_by=position
+        Index("ix_applications_creator_id_rank_id", "creator_id", "rank", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -39,6 +61,8 @@ class Application(Base):
     
     salary = Column(String, nullable=True)
     position = Column(Integer, default=0)
+    # fractional ordering key (app.core.ordering); NULL sorts last until the next rebalance
+    rank = Column(String(collation="C"), nullable=True)
     starred = Column(Boolean, default=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -49,3 +73,21 @@ class Application(Base):
 
     creator_id = Column(GUID, ForeignKey("users.id"), nullable=False)
     creator = relationship("app.db.models.user.User", back_populates="applications")
+
+    # Generated by Postgres on insert/update, never loaded unless asked for
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+
+
+# Recent applications per folder (dashboard) and folder filters
+Index(
+    "ix_applications_creator_id_folder_id_id",
+    Application.creator_id, Application.folder_id, Application.id.desc(),
+)
+
+
+# the trigram index on company needs pg_trgm before the table is created
+event.listen(
+    Application.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
@@ -1,16 +1,25 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, DDL, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from app.core.config import settings
 from app.db.base import Base
 from fastapi_users_db_sqlalchemy import GUID
 
 
 class Folder(Base):
     __tablename__ = "folders"
+    __table_args__ = (
+        # folders are always listed per user in (rank, id) order
+        Index("ix_folders_creator_id_rank_id", "creator_id", "rank", "id"),
+        # delta sync: the user's folders changed since a token
+        Index("ix_folders_creator_id_updated_at", "creator_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     position = Column(Integer, default=0)
+    # fractional ordering key (app.core.ordering); NULL sorts last until the next rebalance
+    rank = Column(String(collation="C"), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -20,14 +29,66 @@ class Folder(Base):
     creator_id = Column(GUID, ForeignKey("users.id"), nullable=False)
     creator = relationship("app.db.models.user.User", back_populates="folders")
 
-    @property
-    def count(self):
-        return len(self.applications)
-
-    @property
-    def counts_per_status(self):
-        counts = {}
-        for app in self.applications:
-            status_title = app.status.title if app.status else "Unassigned"
-            counts[status_title] = counts.get(status_title, 0) + 1
-        return counts
+
+class FolderStatusCount(Base):
+    """Application count per (folder, status), kept current by a trigger on applications.
+
+    Only maintained with FOLDER_STATUS_COUNTS=summary: app/scripts/folder_status_counts.py
+    installs the trigger and backfills the table, or drops both.
+    Unfiled applications and applications without a status are counted under id 0.
+    """
+    __tablename__ = "folder_status_counts"
+
+    creator_id = Column(GUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    folder_id = Column(Integer, primary_key=True)
+    status_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+FOLDER_STATUS_COUNTS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION folder_status_counts_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE folder_status_counts SET count = count - 1
+        WHERE creator_id = OLD.creator_id
+          AND folder_id = coalesce(OLD.folder_id, 0)
+          AND status_id = coalesce(OLD.status_id, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO folder_status_counts (creator_id, folder_id, status_id, count)
+        VALUES (NEW.creator_id, coalesce(NEW.folder_id, 0), coalesce(NEW.status_id, 0), 1)
+        ON CONFLICT (creator_id, folder_id, status_id)
+        DO UPDATE SET count = folder_status_counts.count + 1;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""")
+
+FOLDER_STATUS_COUNTS_TRIGGER_NAME = "applications_folder_status_counts"
+
+# Also fires for the ON DELETE SET NULL updates when a folder or status is deleted
+FOLDER_STATUS_COUNTS_TRIGGER = DDL(f"""
+CREATE OR REPLACE TRIGGER {FOLDER_STATUS_COUNTS_TRIGGER_NAME}
+AFTER INSERT OR DELETE OR UPDATE OF folder_id, status_id, creator_id ON applications
+FOR EACH ROW EXECUTE FUNCTION folder_status_counts_apply()
+""")
+
+DROP_FOLDER_STATUS_COUNTS_TRIGGER = DDL(f"DROP TRIGGER IF EXISTS {FOLDER_STATUS_COUNTS_TRIGGER_NAME} ON applications")
+
+# the whole summary from scratch; run after emptying the table
+REBUILD_FOLDER_STATUS_COUNTS = DDL("""
+INSERT INTO folder_status_counts (creator_id, folder_id, status_id, count)
+SELECT creator_id, coalesce(folder_id, 0), coalesce(status_id, 0), count(*)
+FROM applications
+GROUP BY 1, 2, 3
+""")
+
+# after every table exists, since the trigger lives on applications. The trigger costs a
+# row lock on a hot summary row per application write, so it only exists in summary mode
+event.listen(Base.metadata, "after_create", FOLDER_STATUS_COUNTS_FUNCTION)
+event.listen(
+    Base.metadata,
+    "after_create",
+    FOLDER_STATUS_COUNTS_TRIGGER.execute_if(callable_=lambda *args, **kwargs: settings.FOLDER_STATUS_COUNTS == "summary"),
+)
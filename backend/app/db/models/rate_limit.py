@@ -0,0 +1,15 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from app.db.base import Base
+
+
+class RateLimitCounter(Base):
+    """Fixed-window rate limit hits shared by every worker (RATE_LIMIT_STORAGE=postgres).
+
+    Unlogged: a crash only resets the limits.
+    """
+    __tablename__ = "rate_limit_counters"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db.base import Base
 from fastapi_users_db_sqlalchemy import GUID
 
@@ -9,8 +10,9 @@ class Tag(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, unique=True, index=True)
     color = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    creator_id = Column(GUID, ForeignKey("users.id"), nullable=False)
+    creator_id = Column(GUID, ForeignKey("users.id"), nullable=False, index=True)
     creator = relationship("app.db.models.user.User")
 
 class Status(Base):
@@ -18,8 +20,9 @@ class Status(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, unique=True, index=True)
     color = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    creator_id = Column(GUID, ForeignKey("users.id"), nullable=False)
+    creator_id = Column(GUID, ForeignKey("users.id"), nullable=False, index=True)
     creator = relationship("app.db.models.user.User")
 
 class Priority(Base):
@@ -27,6 +30,7 @@ class Priority(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, unique=True, index=True)
     color = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    creator_id = Column(GUID, ForeignKey("users.id"), nullable=False)
+    creator_id = Column(GUID, ForeignKey("users.id"), nullable=False, index=True)
     creator = relationship("app.db.models.user.User")
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+from fastapi_users_db_sqlalchemy import GUID
+
+
+class UserDataVersion(Base):
+    """Per-user counter bumped in the same transaction as every write to the user's data.
+
+    A missing row means version 0. `updated_at` is the stamp the latest write gave its rows.
+    """
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(GUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    # set by every bump; no onupdate, which would overwrite it with the transaction start time
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    # sync tokens older than this may have missed pruned tombstones
+    tombstones_pruned_before = Column(DateTime(timezone=True), nullable=True)
+
+
+class SyncTombstone(Base):
+    """A deleted application, folder, tag, status or priority, kept for delta sync clients."""
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)
+    item_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.logging import logger
+from app.core.metrics import Gauge, Histogram, registry
+
+checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including connecting when the pool grows",
+))
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """The default asyncpg pool, timing every checkout."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            checkout_wait.observe(time.perf_counter() - start)
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    pool = engine.pool
+    registry.register(Gauge("db_pool_size", "Configured number of persistent connections", pool.size))
+    registry.register(Gauge("db_pool_in_use", "Connections currently checked out", pool.checkedout))
+    registry.register(Gauge("db_pool_idle", "Connections idle in the pool", pool.checkedin))
+    # QueuePool counts overflow from -pool_size while the pool is still filling up
+    registry.register(Gauge("db_pool_overflow", "Connections open beyond the pool size", lambda: max(pool.overflow(), 0)))
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Opens up to `connections` connections at once and returns them to the pool."""
+    count = min(connections, engine.pool.size())
+    if count <= 0:
+        return
+    opened = await asyncio.gather(*[engine.connect().start() for _ in range(count)], return_exceptions=True)
+    failures = [result for result in opened if isinstance(result, BaseException)]
+    for connection in opened:
+        if not isinstance(connection, BaseException):
+            await connection.close()
+    if failures:
+        # Not fatal: requests will connect on demand
+        logger.warning(f"Pool warm-up opened {count - len(failures)} of {count} connections: {failures[0]!r}")
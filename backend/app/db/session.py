@@ -1,10 +1,44 @@
 from collections.abc import AsyncGenerator
+from typing import Any, Dict
+import uuid
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import MeteredQueuePool, register_pool_metrics
+
+
+def engine_options() -> Dict[str, Any]:
+    server_settings = {"application_name": settings.PROJECT_NAME, **settings.DB_SERVER_SETTINGS}
+    connect_args: Dict[str, Any] = {
+        "server_settings": server_settings,
+        # the SQLAlchemy adapter prepares statements itself; asyncpg's cache covers its own API
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_PGBOUNCER:
+        # In transaction mode consecutive statements may land on different server connections,
+        # so nothing can be cached and every prepared statement needs a unique name
+        connect_args.update(
+            prepared_statement_cache_size=0,
+            statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
 
 
-engine = create_async_engine(str(settings.DATABASE_URL))
+engine = create_async_engine(str(settings.DATABASE_URL), **engine_options())
+register_pool_metrics(engine)
+instrument_engine(engine)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -1,6 +1,5 @@
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
@@ -10,15 +9,33 @@ from slowapi.errors import RateLimitExceeded
 
 from app.api.main import api_router
 from app.core.config import settings
-from app.core.middleware import log_middleware
-from app.db.init import create_db_and_tables
+from app.core.events import broker
+from app.core.password import async_password_helper
+from app.core.middleware import LoggingMiddleware, MetricsMiddleware, QueryProfileMiddleware
+from app.db.pool import warm_up_pool
+from app.db.session import engine, async_session_maker
+from app.repositories.folder import FolderRepository
 
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-   await create_db_and_tables()
+   # the schema is managed by Alembic (`alembic upgrade head`), not created at startup
+   await warm_up_pool(engine, settings.DB_POOL_WARMUP)
+   if settings.FOLDER_STATUS_COUNTS == "summary":
+      # without the trigger the summary silently drifts from the applications
+      async with async_session_maker() as session:
+         if not await FolderRepository(session).status_counts_trigger_enabled():
+            raise RuntimeError(
+               "FOLDER_STATUS_COUNTS=summary needs the summary trigger: run app/scripts/folder_status_counts.py enable"
+            )
+   await broker.start()
+   await limiter.start()
    yield
+   await limiter.stop()
+   await broker.stop()
+   async_password_helper.shutdown()
+   await engine.dispose()
 
 
 app = FastAPI(
@@ -40,7 +57,11 @@ if settings.all_cors_origins:
     )
 
 app.include_router(api_router, prefix=settings.API_PREFIX)
-app.add_middleware(BaseHTTPMiddleware, dispatch=log_middleware)
+app.add_middleware(LoggingMiddleware)
+if settings.ENVIRONMENT != "production":
+    # inside MetricsMiddleware, which collects the per-request SQL stats it reads
+    app.add_middleware(QueryProfileMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 app.state.limiter = limiter
@@ -1,12 +1,29 @@
-from typing import List, Optional, Dict, Any, Tuple, Literal
+from typing import List, Optional, Dict, Any, Tuple, Literal, AsyncIterator, Sequence
+import re
 import uuid
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, desc, asc
-from sqlalchemy.orm import selectinload
-from fastapi import HTTPException
+from sqlalchemy import select, func, or_, desc, asc, insert, update, delete, literal, union_all, false
+from sqlalchemy.orm import load_only
+
+from app.db.models.application import Application, application_tags
+from app.db.models.selects import Tag, Status, Priority
+from app.db.models.folder import Folder
+from app.repositories.pagination import SortKeys, TotalMode, order_by_keys, keyset_filter, encode_cursor, decode_cursor, count_total
+from app.repositories.batch import check_batch_ownership, batch_update_statement
+from app.repositories.ownership import load_owned
+
+# fields PATCH /applications/batch may change
+BATCH_FIELDS = ("position", "folder_id", "status_id", "starred", "rank")
+
+
+def build_prefix_tsquery(query_str: str) -> Optional[str]:
+    """Turns free text into a `to_tsquery` string where every word is an ANDed prefix match."""
+    words = re.findall(r"\w+", query_str)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
 
-from app.db.models.application import Application
-from app.db.models.selects import Status, Priority
 
 class ApplicationRepository:
     def __init__(self, session: AsyncSession):
@@ -15,124 +32,253 @@ class ApplicationRepository:
     async def create(self, application: Application) -> Application:
         self.session.add(application)
         await self.session.commit()
-        # Re-fetch with eager loading
         return await self.get_by_id(application.id)
 
-    async def update(self, application: Application) -> Application:
+    async def bulk_create(self, rows: List[Dict[str, Any]], tag_ids: List[List[int]]) -> List[int]:
+        """Inserts many applications with multi-row INSERT ... RETURNING, without re-fetching them.
+
+        `tag_ids[i]` are the tags of `rows[i]`. The caller commits.
+        """
+        if not rows:
+            return []
+        statement = insert(Application).returning(Application.id, sort_by_parameter_order=True)
+        ids = (await self.session.execute(statement, rows)).scalars().all()
+
+        links = [
+            {"application_id": application_id, "tag_id": tag_id}
+            for application_id, application_tag_ids in zip(ids, tag_ids)
+            for tag_id in application_tag_ids
+        ]
+        if links:
+            await self.session.execute(insert(application_tags), links)
+        return ids
+
+    async def resolve_references(
+        self, user_id: uuid.UUID, titles: Dict[str, set], ids: Dict[str, set]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Looks up the user's tags, statuses, priorities and folders by title or id in one query.
+
+        Returns `{kind: {"titles": {title: id}, "ids": {id, ...}}}` for the kinds
+        tags, statuses, priorities and folders.
+        """
+        kinds = {"tags": Tag, "statuses": Status, "priorities": Priority, "folders": Folder}
+        resolved = {kind: {"titles": {}, "ids": set()} for kind in kinds}
+        if not any(titles.values()) and not any(ids.values()):
+            return resolved
+
+        query = union_all(*[
+            select(literal(kind).label("kind"), model.id, model.title)
+            .where(
+                model.creator_id == user_id,
+                or_(
+                    model.title.in_(titles.get(kind, set())) if titles.get(kind) else false(),
+                    model.id.in_(ids.get(kind, set())) if ids.get(kind) else false(),
+                ),
+            )
+            for kind, model in kinds.items()
+        ])
+        for kind, item_id, title in (await self.session.execute(query)).all():
+            resolved[kind]["titles"][title] = item_id
+            resolved[kind]["ids"].add(item_id)
+        return resolved
+
+    async def update(self, application_id: int, values: Dict[str, Any], updated_at: datetime) -> Application:
+        """UPDATE ... RETURNING the row and commits; the loaded instance is refreshed in place."""
+        statement = (
+            update(Application)
+            .where(Application.id == application_id)
+            .values(**values, updated_at=updated_at)
+            .returning(Application)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        application = (await self.session.execute(statement)).scalar_one()
         await self.session.commit()
-        # Re-fetch with eager loading
-        return await self.get_by_id(application.id)
+        return application
 
-    async def delete(self, application: Application) -> None:
-        await self.session.delete(application)
+    async def delete(self, application_id: int) -> None:
+        # application_tags rows go with it (ON DELETE CASCADE), so nothing is loaded first
+        await self.session.execute(delete(Application).where(Application.id == application_id))
         await self.session.commit()
 
-    async def get_by_id(self, application_id: int) -> Optional[Application]:
-        query = (
-            select(Application)
-            .options(
-                selectinload(Application.tags),
-                selectinload(Application.status),
-                selectinload(Application.priority),
-                selectinload(Application.folder)
+    async def replace_tags(self, application_id: int, user_id: uuid.UUID, tag_ids: List[int]) -> None:
+        """Sets the application's tags to those of `tag_ids` the user owns, without loading the collection."""
+        await self.session.execute(delete(application_tags).where(application_tags.c.application_id == application_id))
+        if tag_ids:
+            await self.session.execute(
+                insert(application_tags).from_select(
+                    ["application_id", "tag_id"],
+                    select(literal(application_id), Tag.id).where(Tag.id.in_(tag_ids), Tag.creator_id == user_id),
+                )
             )
-            .where(Application.id == application_id)
+
+    async def verify_batch_ownership(self, application_ids: List[int], user_id: uuid.UUID) -> None:
+        await check_batch_ownership(self.session, Application, application_ids, user_id)
+
+    async def batch_update(self, user_id: uuid.UUID, items: List[Dict[str, Any]], updated_at: datetime) -> Sequence[Any]:
+        """Applies many `{id, <BATCH_FIELDS>...}` changes in one statement and commits.
+
+        Returns the changed fields of every updated row, without loading the applications.
+        """
+        statement = batch_update_statement(Application, user_id, items, BATCH_FIELDS, updated_at).returning(
+            Application.id, *[getattr(Application, name) for name in BATCH_FIELDS], Application.updated_at
         )
-        result = await self.session.execute(query)
+        rows = (await self.session.execute(statement)).all()
+        await self.session.commit()
+        return rows
+
+    async def touch_referencing(self, user_id: uuid.UUID, column: str, item_id: int, updated_at: datetime) -> None:
+        """Stamps the user's applications that point at a folder, status, priority or tag about to be deleted.
+
+        The foreign keys clear those references without touching `updated_at`, so delta sync would miss them.
+        `column` is one of folder_id, status_id, priority_id or tag_id. The caller commits.
+        """
+        if column == "tag_id":
+            condition = Application.id.in_(
+                select(application_tags.c.application_id).where(application_tags.c.tag_id == item_id)
+            )
+        else:
+            condition = getattr(Application, column) == item_id
+        await self.session.execute(
+            update(Application)
+            .where(Application.creator_id == user_id, condition)
+            .values(updated_at=updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_by_id(self, application_id: int) -> Optional[Application]:
+        result = await self.session.execute(select(Application).where(Application.id == application_id))
         return result.scalars().first()
 
-    async def verify_ownership(self, application_id: int, user_id: uuid.UUID) -> Application:
-        application = await self.get_by_id(application_id)
-        if not application:
-            raise HTTPException(status_code=404, detail="Application not found")
-        if application.creator_id != user_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-        return application
+    async def get_tag_ids(self, application_ids: List[int]) -> Dict[int, List[int]]:
+        """Tag ids per application, straight from the association table."""
+        tag_ids = {application_id: [] for application_id in application_ids}
+        if not application_ids:
+            return tag_ids
+        query = (
+            select(application_tags.c.application_id, application_tags.c.tag_id)
+            .where(application_tags.c.application_id.in_(application_ids))
+        )
+        for application_id, tag_id in (await self.session.execute(query)).all():
+            tag_ids[application_id].append(tag_id)
+        return tag_ids
 
-    async def get_all(self, user_id: uuid.UUID, skip: int = 0, limit: int = 100, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc") -> List[Application]:
+    async def stream_columns(
+        self, user_id: uuid.UUID, columns: List[str], query_str: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Any]]:
+        """Yields batches of plain rows (the given columns plus `tag_ids`) through a server-side cursor.
+
+        Uses the same filters as `search`. Rows are not ORM objects, so nothing piles up in the session.
+        """
+        conditions, _ = self._search_conditions(user_id, query_str, filters)
+        tag_ids = (
+            select(func.array_agg(application_tags.c.tag_id))
+            .where(application_tags.c.application_id == Application.id)
+            .scalar_subquery()
+        )
         query = (
-            select(Application)
-            .options(
-                selectinload(Application.tags),
-                selectinload(Application.status),
-                selectinload(Application.priority),
-                selectinload(Application.folder)
-            )
-            .where(Application.creator_id == user_id)
+            select(*[getattr(Application, name) for name in columns], tag_ids.label("tag_ids"))
+            .where(*conditions)
+            .order_by(Application.id)
+            .execution_options(yield_per=batch_size)
         )
-        
-        if sort_by == "status":
-            query = query.join(Status, Application.status_id == Status.id, isouter=True)
-            sort_column = Status.title
-        elif sort_by == "priority":
-            query = query.join(Priority, Application.priority_id == Priority.id, isouter=True)
-            sort_column = Priority.title
-        else:
-            sort_column = getattr(Application, sort_by, None)
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield partition
 
-        if sort_column is not None:
-            if sort_order == "asc":
-                query = query.order_by(asc(sort_column))
-            else:
-                query = query.order_by(desc(sort_column))
+    async def verify_ownership(self, application_id: int, user_id: uuid.UUID) -> Application:
+        return await load_owned(self.session, Application, application_id, user_id)
+
+    async def get_all(self, user_id: uuid.UUID, skip: int = 0, limit: int = 100, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc") -> List[Application]:
+        query = select(Application).where(Application.creator_id == user_id)
+        
+        query, sort_keys = self._apply_sort(query, sort_by, sort_order, [])
+        query = query.order_by(*order_by_keys(sort_keys))
 
         query = query.offset(skip).limit(limit)
         result = await self.session.execute(query)
         return result.scalars().all()
 
     async def search(
-        self, user_id: uuid.UUID, query_str: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, skip: int = 0, limit: int = 100, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc"
-    ) -> Tuple[List[Application], int]:
-        query = (
-            select(Application)
-            .options(
-                selectinload(Application.tags),
-                selectinload(Application.status),
-                selectinload(Application.priority),
-                selectinload(Application.folder)
-            )
-            .where(Application.creator_id == user_id)
+        self, user_id: uuid.UUID, query_str: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, skip: int = 0, limit: int = 100, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc",
+        keyset: bool = False, cursor: Optional[str] = None, total_mode: TotalMode = "exact", columns: Optional[List[str]] = None
+    ) -> Tuple[List[Application], Optional[int], Optional[str]]:
+        """`columns` limits the loaded attributes (e.g. to leave out description/notes); None loads them all."""
+        conditions, rank_columns = self._search_conditions(user_id, query_str, filters)
+
+        # Count on the bare filters, without eager loads or joins for sorting
+        cache_key = ("applications", query_str, tuple(sorted((filters or {}).items())))
+        total = await count_total(
+            self.session, select(Application.id).where(*conditions), total_mode, user_id, cache_key
         )
 
+        query = select(Application).where(*conditions)
+        if columns is not None:
+            query = query.options(load_only(*[getattr(Application, name) for name in columns]))
+
+        query, sort_keys = self._apply_sort(query, sort_by, sort_order, rank_columns)
+        query = query.order_by(*order_by_keys(sort_keys))
+
+        if not keyset and cursor is None:
+            # Paginate
+            query = query.offset(skip).limit(limit)
+            result = await self.session.execute(query)
+            return result.scalars().all(), total, None
+
+        # Keyset: select the sort key values alongside each row and resume after the cursor
+        sort_columns = [column for column, _ in sort_keys]
+        if cursor is not None:
+            query = query.where(keyset_filter(sort_keys, decode_cursor(cursor, len(sort_keys))))
+        query = query.add_columns(*sort_columns).limit(limit + 1)
+        rows = (await self.session.execute(query)).all()
+
+        next_cursor = encode_cursor(rows[limit - 1][1:]) if len(rows) > limit else None
+        return [row[0] for row in rows[:limit]], total, next_cursor
+
+    def _search_conditions(self, user_id: uuid.UUID, query_str: Optional[str], filters: Optional[Dict[str, Any]]) -> Tuple[list, list]:
+        conditions = [Application.creator_id == user_id]
+
+        rank_columns = []
         if query_str:
-            search_filter = or_(
-                Application.title.ilike(f"%{query_str}%"),
-                Application.company.ilike(f"%{query_str}%"),
-                Application.description.ilike(f"%{query_str}%"),
-                Application.role.ilike(f"%{query_str}%")
-            )
-            query = query.where(search_filter)
+            tsquery_str = build_prefix_tsquery(query_str)
+            # Trigram match on company covers typos the full-text index can't
+            search_filter = Application.company.op("%")(query_str)
+            if tsquery_str:
+                tsquery = func.to_tsquery("english", tsquery_str)
+                search_filter = or_(Application.search_vector.op("@@")(tsquery), search_filter)
+                rank_columns.append(func.ts_rank_cd(Application.search_vector, tsquery))
+            rank_columns.append(func.similarity(Application.company, query_str))
+            conditions.append(search_filter)
 
         if filters:
             if "status_id" in filters:
-                query = query.where(Application.status_id == filters["status_id"])
+                conditions.append(Application.status_id == filters["status_id"])
             if "priority_id" in filters:
-                query = query.where(Application.priority_id == filters["priority_id"])
+                conditions.append(Application.priority_id == filters["priority_id"])
             if "folder_id" in filters:
-                query = query.where(Application.folder_id == filters["folder_id"])
+                conditions.append(Application.folder_id == filters["folder_id"])
             if "starred" in filters:
-                query = query.where(Application.starred == filters["starred"])
-            
-        # Count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await self.session.execute(count_query)).scalar_one()
+                conditions.append(Application.starred == filters["starred"])
+
+        return conditions, rank_columns
 
-        if sort_by == "status":
+    def _apply_sort(self, query, sort_by: str, sort_order: Literal["asc", "desc"], rank_columns: list) -> Tuple[Any, SortKeys]:
+        descending = sort_order != "asc"
+        if sort_by == "relevance":
+            # Best matches first; without a search term this falls back to most recently updated
+            sort_keys = [(column, True) for column in rank_columns] + [(Application.updated_at, True)]
+            descending = True
+        elif sort_by == "status":
             query = query.join(Status, Application.status_id == Status.id, isouter=True)
-            sort_column = Status.title
+            sort_keys = [(Status.title, descending)]
         elif sort_by == "priority":
             query = query.join(Priority, Application.priority_id == Priority.id, isouter=True)
-            sort_column = Priority.title
+            sort_keys = [(Priority.title, descending)]
+        elif sort_by == "position":
+            # the board order lives in the fractional ordering keys
+            sort_keys = [(Application.rank, descending)]
         else:
             sort_column = getattr(Application, sort_by, None)
+            sort_keys = [(sort_column, descending)] if sort_column is not None else []
 
-        if sort_column is not None:
-            if sort_order == "asc":
-                query = query.order_by(asc(sort_column))
-            else:
-                query = query.order_by(desc(sort_column))
-
-        # Paginate
-        query = query.offset(skip).limit(limit)
-        result = await self.session.execute(query)
-        return result.scalars().all(), total
+        # id breaks ties so pages are stable and cursors are unique
+        return query, sort_keys + [(Application.id, descending)]
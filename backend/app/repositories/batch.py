@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Type
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import Boolean, Update, case, cast, column, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import Base
+
+
+async def check_batch_ownership(session: AsyncSession, model: Type[Base], ids: Sequence[int], user_id: uuid.UUID) -> None:
+    """One query for the whole batch; same 404/403 as `load_owned`."""
+    rows = (await session.execute(select(model.id, model.creator_id).where(model.id.in_(ids)))).all()
+    owners = {item_id: creator_id for item_id, creator_id in rows}
+    missing = [item_id for item_id in ids if item_id not in owners]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found: {', '.join(map(str, missing))}")
+    if any(creator_id != user_id for creator_id in owners.values()):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+
+def batch_update_statement(
+    model: Type[Base], user_id: uuid.UUID, items: List[Dict[str, Any]], fields: Sequence[str], updated_at: datetime
+) -> Update:
+    """A single UPDATE ... FROM (VALUES ...) applying per-row changes.
+
+    `items` hold an `id` and any subset of `fields`. Every field travels with a `<field>_set` flag,
+    so a field an item leaves out keeps its value while an explicit None still clears it.
+    """
+    table = model.__table__
+    value_columns = [column("id", table.c.id.type)]
+    for name in fields:
+        value_columns += [column(name, table.c[name].type), column(f"{name}_set", Boolean())]
+    rows = [
+        (item["id"], *[value for name in fields for value in (item.get(name), name in item)])
+        for item in items
+    ]
+    changes = values(*value_columns, name="changes").data(rows)
+    return (
+        update(model)
+        .where(model.id == changes.c.id, model.creator_id == user_id)
+        .values(
+            updated_at=updated_at,
+            **{
+                # a VALUES column holding only NULLs comes out as text, hence the cast
+                name: case((changes.c[f"{name}_set"], cast(changes.c[name], table.c[name].type)), else_=getattr(model, name))
+                for name in fields
+            },
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -1,12 +1,16 @@
 from typing import List, Optional, Tuple, Dict, Any
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc, or_
-from sqlalchemy.orm import selectinload
-from fastapi import HTTPException
+from sqlalchemy import select, func, and_, desc, or_, update, delete, text
+from sqlalchemy.orm import load_only
 
-from app.db.models.folder import Folder
+from app.core.config import settings
+from app.db.models.folder import Folder, FolderStatusCount, FOLDER_STATUS_COUNTS_TRIGGER_NAME
 from app.db.models.application import Application
+from app.repositories.pagination import TotalMode, count_total, order_by_keys, keyset_filter, encode_cursor, decode_cursor
+from app.repositories.batch import check_batch_ownership, batch_update_statement
+from app.repositories.ownership import load_owned
+from datetime import datetime
 
 class FolderRepository:
     def __init__(self, session: AsyncSession):
@@ -18,13 +22,22 @@ class FolderRepository:
         await self.session.refresh(folder)
         return folder
 
-    async def update(self, folder: Folder) -> Folder:
+    async def update(self, folder_id: int, values: Dict[str, Any], updated_at: datetime) -> Folder:
+        """UPDATE ... RETURNING the row and commits; the loaded instance is refreshed in place."""
+        statement = (
+            update(Folder)
+            .where(Folder.id == folder_id)
+            .values(**values, updated_at=updated_at)
+            .returning(Folder)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        folder = (await self.session.execute(statement)).scalar_one()
         await self.session.commit()
-        await self.session.refresh(folder)
         return folder
 
-    async def delete(self, folder: Folder) -> None:
-        await self.session.delete(folder)
+    async def delete(self, folder_id: int) -> None:
+        # the foreign key unfiles its applications (ON DELETE SET NULL), so they are not loaded first
+        await self.session.execute(delete(Folder).where(Folder.id == folder_id))
         await self.session.commit()
 
     async def get_by_id(self, folder_id: int) -> Optional[Folder]:
@@ -32,96 +45,171 @@ class FolderRepository:
         return result.scalars().first()
 
     async def verify_ownership(self, folder_id: int, user_id: uuid.UUID) -> Folder:
-        folder = await self.get_by_id(folder_id)
-        if not folder:
-            raise HTTPException(status_code=404, detail="Folder not found")
-        if folder.creator_id != user_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-        return folder
+        return await load_owned(self.session, Folder, folder_id, user_id)
+
+    async def verify_batch_ownership(self, folder_ids: List[int], user_id: uuid.UUID) -> None:
+        await check_batch_ownership(self.session, Folder, folder_ids, user_id)
+
+    async def batch_update(self, user_id: uuid.UUID, items: List[Dict[str, Any]], updated_at: datetime) -> List[Any]:
+        """Sets many folder positions and ranks in one statement and commits."""
+        statement = batch_update_statement(Folder, user_id, items, ("position", "rank"), updated_at).returning(
+            Folder.id, Folder.position, Folder.rank, Folder.updated_at
+        )
+        rows = (await self.session.execute(statement)).all()
+        await self.session.commit()
+        return rows
 
     async def get_all(self, user_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Folder]:
-        query = select(Folder).where(Folder.creator_id == user_id).offset(skip).limit(limit)
+        query = select(Folder).where(Folder.creator_id == user_id).order_by(Folder.rank, Folder.id).offset(skip).limit(limit)
         result = await self.session.execute(query)
         return result.scalars().all()
 
     async def get_with_recent_applications(
-        self, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-    ) -> Tuple[List[Tuple[Optional[Folder], List[Application], int]], int]:
+        self, user_id: uuid.UUID, skip: int = 0, limit: int = 100, recent_limit: int = 5, columns: Optional[List[str]] = None
+    ) -> Tuple[List[Tuple[Optional[Folder], List[Application], int, Dict[Optional[int], int]]], int]:
         # Get folders
-        folders_query = select(Folder).where(Folder.creator_id == user_id).offset(skip).limit(limit)
+        folders_query = (
+            select(Folder)
+            .where(Folder.creator_id == user_id)
+            .order_by(Folder.rank, Folder.id)
+            .offset(skip)
+            .limit(limit)
+        )
         folders_result = await self.session.execute(folders_query)
         folders = folders_result.scalars().all()
-        
+
         # Count total folders
         count_query = select(func.count()).select_from(Folder).where(Folder.creator_id == user_id)
         total_folders = (await self.session.execute(count_query)).scalar_one()
 
-        result = []
-        for folder in folders:
-            # Get app count
-            app_count_query = select(func.count()).select_from(Application).where(
-                and_(Application.folder_id == folder.id, Application.creator_id == user_id)
-            )
-            app_count = (await self.session.execute(app_count_query)).scalar_one()
-
-            # Get recent apps
-            recent_apps_query = (
-                select(Application)
-                .options(
-                    selectinload(Application.tags),
-                    selectinload(Application.status),
-                    selectinload(Application.priority),
-                    selectinload(Application.folder)
-                )
-                .where(and_(Application.folder_id == folder.id, Application.creator_id == user_id))
-                .order_by(desc(Application.id))
-                .limit(5)
-            )
-            recent_apps = (await self.session.execute(recent_apps_query)).scalars().all()
-            result.append((folder, recent_apps, app_count))
+        # Applications on this page: the listed folders plus the unfiled bucket (folder_id IS NULL)
+        folder_ids = [folder.id for folder in folders]
+        page_filter = and_(
+            Application.creator_id == user_id,
+            or_(Application.folder_id.in_(folder_ids), Application.folder_id.is_(None)),
+        )
 
-        # Handle unfiled applications
-        unfiled_count_query = select(func.count()).select_from(Application).where(
-            and_(Application.folder_id.is_(None), Application.creator_id == user_id)
+        # One grouped aggregate for every folder's per-status counts, totals summed from it
+        status_counts = await self.get_status_counts(user_id, folder_ids, include_unfiled=True)
+        counts = {folder_id: sum(by_status.values()) for folder_id, by_status in status_counts.items()}
+
+        # One windowed query for the most recent apps of every folder
+        ranked = (
+            select(
+                Application.id,
+                func.row_number()
+                .over(partition_by=Application.folder_id, order_by=desc(Application.id))
+                .label("rank"),
+            )
+            .where(page_filter)
+            .subquery()
+        )
+        recent_apps_query = (
+            select(Application)
+            .join(ranked, Application.id == ranked.c.id)
+            .where(ranked.c.rank <= recent_limit)
+            .order_by(desc(Application.id))
         )
-        unfiled_count = (await self.session.execute(unfiled_count_query)).scalar_one()
+        if columns is not None:
+            # folder_id is always needed to group the applications under their folder
+            loaded = set(columns) | {"folder_id"}
+            recent_apps_query = recent_apps_query.options(load_only(*[getattr(Application, name) for name in loaded]))
+        recent_apps = (await self.session.execute(recent_apps_query)).scalars().all()
+
+        recent_by_folder: Dict[Optional[int], List[Application]] = {}
+        for application in recent_apps:
+            recent_by_folder.setdefault(application.folder_id, []).append(application)
+
+        result = [
+            (folder, recent_by_folder.get(folder.id, []), counts.get(folder.id, 0), status_counts.get(folder.id, {}))
+            for folder in folders
+        ]
 
+        # Handle unfiled applications
+        unfiled_count = counts.get(None, 0)
         if unfiled_count > 0:
-             recent_unfiled_query = (
-                select(Application)
-                .options(
-                    selectinload(Application.tags),
-                    selectinload(Application.status),
-                    selectinload(Application.priority),
-                    selectinload(Application.folder)
+            result.insert(0, (None, recent_by_folder.get(None, []), unfiled_count, status_counts.get(None, {})))
+            total_folders += 1
+
+        return result, total_folders
+
+    async def get_status_counts(
+        self, user_id: uuid.UUID, folder_ids: List[int], include_unfiled: bool = False
+    ) -> Dict[Optional[int], Dict[Optional[int], int]]:
+        """Application counts per status for each folder, as `{folder_id: {status_id: count}}`.
+
+        The unfiled bucket and applications without a status are keyed by None.
+        """
+        if not folder_ids and not include_unfiled:
+            return {}
+
+        if settings.FOLDER_STATUS_COUNTS == "summary":
+            # the summary table stores "none" as 0
+            query = (
+                select(FolderStatusCount.folder_id, FolderStatusCount.status_id, FolderStatusCount.count)
+                .where(
+                    FolderStatusCount.creator_id == user_id,
+                    FolderStatusCount.folder_id.in_(folder_ids + [0] if include_unfiled else folder_ids),
+                    FolderStatusCount.count > 0,
                 )
-                .where(and_(Application.folder_id.is_(None), Application.creator_id == user_id))
-                .order_by(desc(Application.id))
-                .limit(5)
             )
-             recent_unfiled = (await self.session.execute(recent_unfiled_query)).scalars().all()
-             result.insert(0, (None, recent_unfiled, unfiled_count))
-             total_folders += 1
+        else:
+            folder_filter = Application.folder_id.in_(folder_ids)
+            if include_unfiled:
+                folder_filter = or_(folder_filter, Application.folder_id.is_(None))
+            query = (
+                select(Application.folder_id, Application.status_id, func.count())
+                .where(Application.creator_id == user_id, folder_filter)
+                .group_by(Application.folder_id, Application.status_id)
+            )
 
-        return result, total_folders
+        status_counts: Dict[Optional[int], Dict[Optional[int], int]] = {}
+        for folder_id, status_id, count in (await self.session.execute(query)).all():
+            status_counts.setdefault(folder_id or None, {})[status_id or None] = count
+        return status_counts
+
+    async def status_counts_trigger_enabled(self) -> bool:
+        """Whether the trigger that maintains folder_status_counts is installed and enabled."""
+        query = text(
+            "SELECT EXISTS (SELECT FROM pg_trigger WHERE tgrelid = 'applications'::regclass "
+            "AND tgname = :name AND tgenabled <> 'D')"
+        )
+        return (await self.session.execute(query, {"name": FOLDER_STATUS_COUNTS_TRIGGER_NAME})).scalar_one()
 
     async def search(
-        self, user_id: uuid.UUID, query_str: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, skip: int = 0, limit: int = 100
-    ) -> Tuple[List[Folder], int]:
-        query = select(Folder).where(Folder.creator_id == user_id)
+        self, user_id: uuid.UUID, query_str: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, skip: int = 0, limit: int = 100,
+        keyset: bool = False, cursor: Optional[str] = None, total_mode: TotalMode = "exact"
+    ) -> Tuple[List[Folder], Optional[int], Optional[str]]:
+        conditions = [Folder.creator_id == user_id]
         
         if query_str:
-            query = query.where(Folder.title.ilike(f"%{query_str}%"))
+            conditions.append(Folder.title.ilike(f"%{query_str}%"))
             
         if filters:
             # Implement filters if any
             pass
             
         # Count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await self.session.execute(count_query)).scalar_one()
+        total = await count_total(
+            self.session, select(Folder.id).where(*conditions), total_mode, user_id, ("folders", query_str)
+        )
 
-        # Paginate
-        query = query.offset(skip).limit(limit)
-        result = await self.session.execute(query)
-        return result.scalars().all(), total
+        query = select(Folder).where(*conditions)
+        sort_keys = [(Folder.rank, False), (Folder.id, False)]
+        query = query.order_by(*order_by_keys(sort_keys))
+
+        if not keyset and cursor is None:
+            # Paginate
+            query = query.offset(skip).limit(limit)
+            result = await self.session.execute(query)
+            return result.scalars().all(), total, None
+
+        if cursor is not None:
+            query = query.where(keyset_filter(sort_keys, decode_cursor(cursor, len(sort_keys))))
+        folders = (await self.session.execute(query.limit(limit + 1))).scalars().all()
+
+        next_cursor = None
+        if len(folders) > limit:
+            last = folders[limit - 1]
+            next_cursor = encode_cursor([last.rank, last.id])
+        return folders[:limit], total, next_cursor
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple, Type
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ordering import keys_between
+from app.db.base import Base
+from app.repositories.batch import batch_update_statement
+
+# rows per UPDATE while renumbering, well below the bind parameter limit
+REBALANCE_CHUNK_SIZE = 5000
+
+
+class OrderingRepository:
+    """Fractional `rank` keys of a user's applications or folders."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def last_rank(self, model: Type[Base], user_id: uuid.UUID) -> Optional[str]:
+        query = select(func.max(model.rank)).where(model.creator_id == user_id)
+        return (await self.session.execute(query)).scalar_one_or_none()
+
+    async def get_neighbours(
+        self, model: Type[Base], user_id: uuid.UUID, ids: Iterable[int]
+    ) -> Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """(previous rank, rank, next rank) of the user's rows among `ids`; ids that are missing or
+        not theirs are left out."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        row = aliased(model)
+
+        def adjacent(before: bool):
+            query = select(model.rank).where(
+                model.creator_id == user_id,
+                model.rank < row.rank if before else model.rank > row.rank,
+            )
+            return query.order_by(model.rank.desc() if before else model.rank).limit(1).scalar_subquery()
+
+        query = select(row.id, adjacent(True), row.rank, adjacent(False)).where(
+            row.creator_id == user_id, row.id.in_(ids)
+        )
+        return {item_id: tuple(ranks) for item_id, *ranks in (await self.session.execute(query)).all()}
+
+    async def rebalance(self, model: Type[Base], user_id: uuid.UUID, updated_at: datetime) -> int:
+        """Gives every row of the user short, evenly spaced keys in the current order. The caller commits."""
+        query = select(model.id).where(model.creator_id == user_id).order_by(model.rank, model.id)
+        ids = (await self.session.execute(query)).scalars().all()
+        keys = keys_between(None, None, len(ids))
+        for start in range(0, len(ids), REBALANCE_CHUNK_SIZE):
+            items = [
+                {"id": item_id, "rank": key}
+                for item_id, key in zip(ids[start:start + REBALANCE_CHUNK_SIZE], keys[start:start + REBALANCE_CHUNK_SIZE])
+            ]
+            await self.session.execute(batch_update_statement(model, user_id, items, ("rank",), updated_at))
+        return len(ids)
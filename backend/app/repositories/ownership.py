@@ -0,0 +1,41 @@
+from typing import Type
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
+
+from app.db.base import Base
+
+
+async def load_owned(
+    session: AsyncSession,
+    model: Type[Base],
+    resource_id: int,
+    user_id: uuid.UUID,
+    owner_field: str = "creator_id",
+    superuser: bool = False,
+) -> Base:
+    """The resource if `user_id` owns it (a `superuser` may load anyone's), else 404/403.
+
+    One query scoped to the owner, skipped when the row is already in the session; only
+    failures pay for telling a missing resource from someone else's.
+    """
+    owner = getattr(model, owner_field)
+    obj = session.identity_map.get(identity_key(model, resource_id))
+    if obj is None:
+        query = select(model).where(model.id == resource_id)
+        if not superuser:
+            query = query.where(owner == user_id)
+        obj = (await session.execute(query)).scalar_one_or_none()
+
+    if obj is None:
+        found = (await session.execute(select(exists().where(model.id == resource_id)))).scalar()
+        if not found:
+            raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    if not superuser and getattr(obj, owner_field) != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return obj
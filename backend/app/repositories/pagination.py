@@ -0,0 +1,115 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Hashable, List, Literal, Optional, Sequence, Tuple
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, or_, asc, desc, false, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.cache import count_cache
+from app.db.explain import explain
+from app.repositories.sync import SyncRepository
+
+# (expression, descending) pairs; the last key must be unique (the primary key)
+SortKeys = List[Tuple[ColumnElement, bool]]
+
+# exact: COUNT(*), none: skip it, estimate: planner row estimate, cached: exact count memoized per user/filter
+TotalMode = Literal["exact", "none", "estimate", "cached"]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Packs the sort key values of the last row on a page into an opaque token."""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != key_count:
+        # The cursor was issued for a different sort
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        return [_decode_value(value) for value in values]
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def order_by_keys(keys: SortKeys) -> List[ColumnElement]:
+    # Spelled out to match Postgres' defaults, which keyset_filter relies on
+    return [
+        desc(column).nulls_first() if descending else asc(column).nulls_last()
+        for column, descending in keys
+    ]
+
+
+def keyset_filter(keys: SortKeys, values: Sequence[Any]) -> ColumnElement:
+    """Rows strictly after `values` in the order given by `keys`.
+
+    Follows Postgres NULL ordering (NULLS LAST for ASC, NULLS FIRST for DESC), so nullable
+    sort columns such as joined status/priority titles page correctly.
+    """
+    clauses = []
+    for i, ((column, descending), value) in enumerate(zip(keys, values)):
+        if value is None:
+            after = column.is_not(None) if descending else false()
+        elif descending:
+            after = column < value
+        else:
+            after = or_(column > value, column.is_(None))
+
+        equal_prefix = [
+            prev_column.is_(None) if prev_value is None else prev_column == prev_value
+            for (prev_column, _), prev_value in zip(keys[:i], values[:i])
+        ]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+async def count_total(
+    session: AsyncSession, statement: Select, mode: TotalMode, user_id: uuid.UUID, cache_key: Hashable
+) -> Optional[int]:
+    """Total for a listing; `statement` selects the matching ids, without ordering, eager loads or paging."""
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        plan = await explain(session, statement)
+        return int(plan["Plan Rows"])
+
+    if mode == "cached":
+        # keyed on the user's data version, which every write bumps in its own transaction,
+        # so a write retires the cached counts in every worker at once
+        cache_key = (await SyncRepository(session).get_version(user_id), cache_key)
+        total = count_cache.get(user_id, cache_key)
+        if total is not None:
+            return total
+
+    count_query = select(func.count()).select_from(statement.subquery())
+    total = (await session.execute(count_query)).scalar_one()
+    if mode == "cached":
+        count_cache.set(user_id, cache_key, total)
+    return total
@@ -1,6 +1,6 @@
-from typing import List, Optional, Type
+from typing import Dict, List, Optional, Type
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, literal, union_all, update, delete, exists
 from fastapi import HTTPException
 import uuid
 
@@ -24,33 +24,32 @@ class SelectsRepository:
         return instance
 
     async def update(self, model: Type[Base], item_id: int, user_id: uuid.UUID, **kwargs) -> Base:
-        instance = await self.get_by_id(model, item_id)
-        if not instance:
-            raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
-
-        # Verify ownership
-        if instance.creator_id != user_id:
-            raise HTTPException(status_code=403, detail=f"You do not own this {model.__name__}")
-
-        for key, value in kwargs.items():
-            setattr(instance, key, value)
-        
+        # scoped to the owner, so the ownership check and the write are one statement
+        statement = (
+            update(model)
+            .where(model.id == item_id, model.creator_id == user_id)
+            .values(**kwargs)
+            .returning(model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        instance = (await self.session.execute(statement)).scalar_one_or_none()
+        if instance is None:
+            await self._not_owned(model, item_id)
         await self.session.commit()
-        await self.session.refresh(instance)
         return instance
 
     async def delete(self, model: Type[Base], item_id: int, user_id: uuid.UUID) -> None:
-        instance = await self.get_by_id(model, item_id)
-        if not instance:
-            raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
-
-        # Verify ownership
-        if instance.creator_id != user_id:
-            raise HTTPException(status_code=403, detail=f"You do not own this {model.__name__}")
-
-        await self.session.delete(instance)
+        statement = delete(model).where(model.id == item_id, model.creator_id == user_id).returning(model.id)
+        if (await self.session.execute(statement)).scalar_one_or_none() is None:
+            await self._not_owned(model, item_id)
         await self.session.commit()
 
+    async def _not_owned(self, model: Type[Base], item_id: int) -> None:
+        """Raises the 404 or 403 for a scoped write that matched no row."""
+        if not (await self.session.execute(select(exists().where(model.id == item_id)))).scalar():
+            raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+        raise HTTPException(status_code=403, detail=f"You do not own this {model.__name__}")
+
     async def get_by_id(self, model: Type[Base], item_id: int) -> Optional[Base]:
         result = await self.session.execute(select(model).where(model.id == item_id))
         return result.scalars().first()
@@ -58,3 +57,18 @@ class SelectsRepository:
     async def get_all(self, model: Type[Base], user_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Base]:
         result = await self.session.execute(select(model).where(model.creator_id == user_id).offset(skip).limit(limit))
         return result.scalars().all()
+
+    async def get_reference_data(self, user_id: uuid.UUID) -> Dict[str, List[dict]]:
+        """All of a user's tags, statuses and priorities in one round trip."""
+        kinds = {"tags": Tag, "statuses": Status, "priorities": Priority}
+        query = union_all(*[
+            select(literal(kind).label("kind"), model.id, model.title, model.color)
+            .where(model.creator_id == user_id)
+            for kind, model in kinds.items()
+        ])
+        rows = (await self.session.execute(query)).all()
+
+        data = {kind: [] for kind in kinds}
+        for kind, item_id, title, color in sorted(rows, key=lambda row: row.id):
+            data[kind].append({"id": item_id, "title": title, "color": color})
+        return data
@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Type
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select, delete, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models.sync import UserDataVersion, SyncTombstone
+
+
+# session.info key of the versions read or bumped in the session, so a request reads each once
+VERSIONS_INFO_KEY = "user_data_versions"
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_versions(session: Session) -> None:
+    # a rolled back bump never happened, and its number goes to the next write
+    session.info.pop(VERSIONS_INFO_KEY, None)
+
+
+class SyncRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_version(self, user_id: uuid.UUID) -> int:
+        versions = self.session.info.setdefault(VERSIONS_INFO_KEY, {})
+        if user_id not in versions:
+            query = select(UserDataVersion.version).where(UserDataVersion.user_id == user_id)
+            versions[user_id] = (await self.session.execute(query)).scalar_one_or_none() or 0
+        return versions[user_id]
+
+    async def get_state(self, user_id: uuid.UUID) -> Optional[UserDataVersion]:
+        query = select(UserDataVersion).where(UserDataVersion.user_id == user_id)
+        state = (await self.session.execute(query)).scalars().first()
+        self.session.info.setdefault(VERSIONS_INFO_KEY, {})[user_id] = state.version if state is not None else 0
+        return state
+
+    async def bump_version(self, user_id: uuid.UUID) -> Row:
+        """Increments the user's version in the current transaction; the caller's commit publishes it.
+
+        The row lock it takes also orders concurrent writers of the same user. Returns the new
+        `version` and the `updated_at` stamp for the rows the write touches: it is read after the
+        lock is held, so stamps grow in commit order, which `now()` (transaction start) does not.
+        """
+        statement = insert(UserDataVersion).values(user_id=user_id, version=1, updated_at=func.clock_timestamp())
+        statement = statement.on_conflict_do_update(
+            index_elements=[UserDataVersion.user_id],
+            set_={"version": UserDataVersion.version + 1, "updated_at": func.clock_timestamp()},
+        ).returning(UserDataVersion.version, UserDataVersion.updated_at)
+        change = (await self.session.execute(statement)).one()
+        self.session.info.setdefault(VERSIONS_INFO_KEY, {})[user_id] = change.version
+        return change
+
+    async def add_tombstone(self, user_id: uuid.UUID, kind: str, item_id: int, deleted_at: datetime) -> None:
+        self.session.add(SyncTombstone(user_id=user_id, kind=kind, item_id=item_id, deleted_at=deleted_at))
+
+    async def prune_tombstones(self, user_id: uuid.UUID, before: datetime) -> None:
+        """Drops tombstones older than `before` and records the cutoff. Needs the bump's row lock."""
+        result = await self.session.execute(
+            delete(SyncTombstone).where(SyncTombstone.user_id == user_id, SyncTombstone.deleted_at < before)
+        )
+        if result.rowcount:
+            await self.session.execute(
+                update(UserDataVersion)
+                .where(UserDataVersion.user_id == user_id)
+                .values(tombstones_pruned_before=before)
+            )
+
+    async def get_tombstones(self, user_id: uuid.UUID, since: datetime) -> Dict[str, List[int]]:
+        query = (
+            select(SyncTombstone.kind, SyncTombstone.item_id)
+            .where(SyncTombstone.user_id == user_id, SyncTombstone.deleted_at > since)
+            .order_by(SyncTombstone.deleted_at, SyncTombstone.id)
+        )
+        deleted: Dict[str, List[int]] = {}
+        for kind, item_id in (await self.session.execute(query)).all():
+            deleted.setdefault(kind, []).append(item_id)
+        return deleted
+
+    async def get_changed(self, model: Type[Base], user_id: uuid.UUID, since: Optional[datetime]) -> List[Base]:
+        """The user's rows of `model` written after `since` (all of them when None), oldest first."""
+        query = select(model).where(model.creator_id == user_id)
+        if since is not None:
+            query = query.where(model.updated_at > since)
+        result = await self.session.execute(query.order_by(model.updated_at, model.id))
+        return result.scalars().all()
@@ -121,6 +121,8 @@ class ApplicationUpdate(BaseModel):
 
 class ApplicationRead(ApplicationBase):
     id: int
+    # ordering key; sort_by=position sorts by it
+    rank: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     tags: List[TagRead] = []
@@ -142,3 +144,27 @@ class ApplicationReadBrief(BaseModel):
 
     class Config:
         from_attributes = True
+
+# PATCH /applications/batch: only the fields present are changed, so `folder_id: null` unfiles.
+# after_id and/or before_id move the item between those neighbours; with only one, right next to it
+# (before_id of the first item moves it to the start, after_id of the last one to the end)
+class ApplicationBatchItem(BaseModel):
+    id: int
+    position: Optional[int] = None
+    folder_id: Optional[int] = None
+    status_id: Optional[int] = None
+    starred: Optional[bool] = None
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+class ApplicationBatchUpdate(BaseModel):
+    updates: List[ApplicationBatchItem]
+
+class ApplicationBatchRead(BaseModel):
+    id: int
+    position: Optional[int] = None
+    folder_id: Optional[int] = None
+    status_id: Optional[int] = None
+    starred: Optional[bool] = None
+    rank: Optional[str] = None
+    updated_at: datetime
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Union
+from datetime import datetime
 from app.schemas.application import ApplicationRead, ApplicationReadBrief
 
 class FolderBase(BaseModel):
@@ -15,11 +16,33 @@ class FolderUpdate(BaseModel):
 
 class FolderRead(FolderBase):
     id: int
+    rank: Optional[str] = None
+    count: int = 0
+    counts_per_status: Dict[str, int] = {}
     
     class Config:
         from_attributes = True
 
+# PATCH /folders/batch: after_id and/or before_id move the folder between those neighbours; with only
+# one, right next to it
+class FolderBatchItem(BaseModel):
+    id: int
+    position: Optional[int] = None
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+class FolderBatchUpdate(BaseModel):
+    updates: List[FolderBatchItem]
+
+class FolderBatchRead(BaseModel):
+    id: int
+    position: Optional[int] = None
+    rank: Optional[str] = None
+    updated_at: datetime
+
 class FolderWithRecentApplications(BaseModel):
     folder: Optional[FolderRead] # Optional for unfiled
-    recent_applications: List[ApplicationRead]
+    # full, brief or custom (dict) projection; smart union mode keeps each item's own type
+    recent_applications: List[Union[Dict[str, Any], ApplicationRead, ApplicationReadBrief]]
     application_count: int
+    counts_per_status: Dict[str, int] = {}
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from app.schemas.application import ApplicationRead
+from app.schemas.folder import FolderRead
+from app.schemas.selects import SelectRead
+
+class SyncChanges(BaseModel):
+    # pass back as `since`; None until the user's first write
+    token: Optional[str] = None
+    applications: List[ApplicationRead] = []
+    folders: List[FolderRead] = []
+    tags: List[SelectRead] = []
+    statuses: List[SelectRead] = []
+    priorities: List[SelectRead] = []
+    # ids deleted since the token, per kind (applications, folders, tags, statuses, priorities)
+    deleted: Dict[str, List[int]] = {}
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+import uuid
+
+# Add the parent directory to sys.path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi_users.authentication import JWTStrategy
+from fastapi_users.db import SQLAlchemyUserDatabase
+from sqlalchemy import delete, event
+
+from app.core.auth import CachedJWTStrategy, UserManager, get_password_hash, user_cache
+from app.core.config import settings
+from app.db.session import engine, async_session_maker
+from app.db.models.user import User
+from app.scripts.benchmark_dashboard import QueryCounter
+
+EMAIL_PREFIX = "benchmark-auth-"
+
+
+async def measure(name, strategy, token, runs, counter):
+    timings = []
+    queries = 0
+    for _ in range(runs):
+        # A session and user manager per run, as every request gets
+        async with async_session_maker() as session:
+            user_manager = UserManager(SQLAlchemyUserDatabase(session, User))
+            counter.count = 0
+            start = time.perf_counter()
+            user = await strategy.read_token(token, user_manager)
+            timings.append((time.perf_counter() - start) * 1_000_000)
+            queries += counter.count
+        assert user is not None
+
+    timings.sort()
+    print(
+        f"{name:<9} runs={runs:<6} queries/request={queries / runs:<5.2f} "
+        f"median={statistics.median(timings):.0f}us p95={timings[int(len(timings) * 0.95) - 1]:.0f}us"
+    )
+
+
+async def benchmark(runs: int):
+    async with async_session_maker() as session:
+        user = User(
+            id=uuid.uuid4(),
+            email=f"{EMAIL_PREFIX}{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password=get_password_hash("pass"),
+            is_active=True,
+            is_superuser=False,
+            is_verified=True,
+        )
+        session.add(user)
+        await session.commit()
+
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        # the same secret and lifetime as the app, so both strategies accept the token
+        uncached = JWTStrategy(secret=settings.SECRET_KEY, lifetime_seconds=3600)
+        cached = CachedJWTStrategy(secret=settings.SECRET_KEY, lifetime_seconds=3600)
+        token = await uncached.write_token(user)
+
+        # warm up the pool, so neither side pays for connecting
+        await measure("warm-up", uncached, token, 10, counter)
+        await measure("uncached", uncached, token, runs, counter)
+        user_cache.invalidate(user.id)
+        await measure("cached", cached, token, runs, counter)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        async with async_session_maker() as session:
+            await session.execute(delete(User).where(User.id == user.id))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-request authentication with and without the user cache")
+    parser.add_argument("--runs", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.runs))
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+# Add the parent directory to sys.path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import event, select, func, and_, desc
+from sqlalchemy.orm import selectinload
+
+from app.db.session import engine, async_session_maker
+from app.db.base import Base
+from app.db.models.folder import Folder
+from app.db.models.application import Application
+from app.repositories.folder import FolderRepository
+from app.scripts.seed_db import seed_db
+
+
+class QueryCounter:
+    """Counts statements sent to the database through the shared engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def legacy_dashboard(session, user_id, skip, limit):
+    # The previous per-folder implementation, kept here as the comparison baseline
+    folders = (await session.execute(
+        select(Folder).where(Folder.creator_id == user_id).offset(skip).limit(limit)
+    )).scalars().all()
+    await session.execute(select(func.count()).select_from(Folder).where(Folder.creator_id == user_id))
+
+    for folder_id in [folder.id for folder in folders] + [None]:
+        folder_filter = Application.folder_id.is_(None) if folder_id is None else Application.folder_id == folder_id
+        await session.execute(
+            select(func.count()).select_from(Application).where(and_(folder_filter, Application.creator_id == user_id))
+        )
+        await session.execute(
+            select(Application)
+            .options(
+                selectinload(Application.tags),
+                selectinload(Application.status),
+                selectinload(Application.priority),
+                selectinload(Application.folder)
+            )
+            .where(and_(folder_filter, Application.creator_id == user_id))
+            .order_by(desc(Application.id))
+            .limit(5)
+        )
+
+
+async def current_dashboard(session, user_id, skip, limit):
+    await FolderRepository(session).get_with_recent_applications(user_id, skip, limit)
+
+
+async def measure(name, dashboard, user_id, per_page, runs, counter):
+    timings = []
+    queries = 0
+    for _ in range(runs):
+        # Fresh session per run so the identity map doesn't hide round trips
+        async with async_session_maker() as session:
+            counter.count = 0
+            start = time.perf_counter()
+            await dashboard(session, user_id, 0, per_page)
+            timings.append((time.perf_counter() - start) * 1000)
+            queries = counter.count
+
+    print(
+        f"{name:<8} per_page={per_page:<5} queries={queries:<6} "
+        f"median={statistics.median(timings):.1f}ms max={max(timings):.1f}ms"
+    )
+
+
+async def benchmark(folders: int, runs: int, page_sizes: list[int]):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    user_id = await seed_db(folder_count=folders)
+
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        for per_page in page_sizes:
+            await measure("legacy", legacy_dashboard, user_id, per_page, runs, counter)
+            await measure("current", current_dashboard, user_id, per_page, runs, counter)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark /folders/dashboard query count and latency (drops and reseeds the database)")
+    parser.add_argument("--folders", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.folders, args.runs, args.page_sizes))
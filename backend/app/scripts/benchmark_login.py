@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+import uuid
+
+# Add the parent directory to sys.path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from fastapi import Depends
+from fastapi_users import BaseUserManager, UUIDIDMixin
+from fastapi_users.db import SQLAlchemyUserDatabase
+from sqlalchemy import delete
+
+from app.core.auth import get_password_hash, get_user_db, get_user_manager
+from app.core.password import password_helper
+from app.db.session import engine, async_session_maker
+from app.db.models.user import User
+from app.main import app
+
+EMAIL_PREFIX = "benchmark-login-"
+PASSWORD = "benchmark-password"
+
+
+class InlineUserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
+    """The stock manager, hashing on the event loop: the comparison baseline."""
+
+
+async def get_inline_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):
+    yield InlineUserManager(user_db, password_helper)
+
+
+async def run(client: httpx.AsyncClient, email: str, logins: int, concurrency: int) -> tuple[list[float], float]:
+    """Probe latencies of GET / while `logins` logins run, `concurrency` at a time."""
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def probe():
+        # measured from when the probe was due, so time the loop spent blocked is counted
+        due = time.perf_counter()
+        while not done.is_set():
+            response = await client.get("/")
+            latencies.append((time.perf_counter() - due) * 1000)
+            assert response.status_code == 200
+            due = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            response = await client.post("/auth/jwt/login", data={"username": email, "password": PASSWORD})
+            assert response.status_code == 200, response.text
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return latencies, elapsed
+
+
+def report(name: str, latencies: list[float], elapsed: float, logins: int) -> None:
+    latencies.sort()
+    p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+    print(
+        f"{name:<9} logins/s={logins / elapsed:<7.1f} probes={len(latencies):<6} "
+        f"probe median={statistics.median(latencies):.1f}ms p99={p99:.1f}ms max={latencies[-1]:.1f}ms"
+    )
+
+
+async def benchmark(logins: int, concurrency: int):
+    email = f"{EMAIL_PREFIX}{uuid.uuid4().hex[:8]}@example.com"
+    async with async_session_maker() as session:
+        user = User(
+            id=uuid.uuid4(), email=email, hashed_password=get_password_hash(PASSWORD),
+            is_active=True, is_superuser=False, is_verified=True,
+        )
+        session.add(user)
+        await session.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            # warm up the pool and the hashing threads
+            await run(client, email, 4, concurrency)
+
+            app.dependency_overrides[get_user_manager] = get_inline_user_manager
+            report("inline", *await run(client, email, logins, concurrency), logins)
+            app.dependency_overrides.pop(get_user_manager)
+            report("executor", *await run(client, email, logins, concurrency), logins)
+    finally:
+        async with async_session_maker() as session:
+            await session.execute(delete(User).where(User.id == user.id))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Latency of an unrelated endpoint during a login storm, hashing inline vs in the pool"
+    )
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.logins, args.concurrency))
@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+import sys
+import os
+
+# Add the parent directory to sys.path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import engine
+from app.db.explain import iter_plan_nodes
+from app.db.models.application import Application
+from app.db.models.folder import Folder, REBUILD_FOLDER_STATUS_COUNTS
+from app.db.models.selects import Status
+from app.repositories.application import ApplicationRepository
+from app.repositories.folder import FolderRepository
+from app.repositories.selects import SelectsRepository
+from app.repositories.sync import SyncRepository
+
+# Tables that grow with usage; a sequential scan on any of them is a missing index
+CHECKED_TABLES = {"applications", "application_tags", "folders", "folder_status_counts"}
+
+EMAIL_PREFIX = "index-check-"
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (id, email, hashed_password, is_active, is_superuser, is_verified)
+    SELECT gen_random_uuid(), CAST(:prefix AS text) || n || '@example.com', 'x', true, false, true
+    FROM generate_series(1, :users) n
+    """,
+    *[
+        f"""
+        INSERT INTO {table} (title, color, creator_id)
+        SELECT '{kind} ' || n || ' ' || u.id, 'blue', u.id
+        FROM users u, generate_series(1, {count}) n
+        WHERE u.email LIKE CAST(:prefix AS text) || '%'
+        """
+        for table, kind, count in (("tags", "Tag", 8), ("statuses", "Status", 6), ("priorities", "Priority", 4))
+    ],
+    """
+    INSERT INTO folders (title, position, rank, creator_id)
+    SELECT 'Folder ' || n, n, 'h' || lpad(n::text, 8, '0'), u.id
+    FROM users u, generate_series(1, :folders) n
+    WHERE u.email LIKE CAST(:prefix AS text) || '%'
+    """,
+    """
+    WITH refs AS (
+        SELECT
+            u.id AS user_id,
+            (SELECT array_agg(id) FROM statuses WHERE creator_id = u.id) AS statuses,
+            (SELECT array_agg(id) FROM priorities WHERE creator_id = u.id) AS priorities,
+            (SELECT array_agg(id) FROM folders WHERE creator_id = u.id) AS folders
+        FROM users u
+        WHERE u.email LIKE CAST(:prefix AS text) || '%'
+    )
+    INSERT INTO applications (
+        title, company, role, description, status_id, priority_id, folder_id, position, rank, starred, creator_id, updated_at
+    )
+    SELECT
+        'Software Engineer ' || n, 'Company ' || (n % 500), 'Backend Developer', 'Job description ' || n,
+        statuses[1 + n % cardinality(statuses)],
+        priorities[1 + n % cardinality(priorities)],
+        CASE WHEN n % 10 = 0 THEN NULL ELSE folders[1 + n % cardinality(folders)] END,
+        n, 'h' || lpad(n::text, 8, '0'), n % 7 = 0, user_id, now() - n * interval '1 minute'
+    FROM refs, generate_series(1, :per_user) n
+    """,
+    """
+    INSERT INTO application_tags (application_id, tag_id)
+    SELECT a.id, t.id
+    FROM applications a
+    JOIN users u ON u.id = a.creator_id AND u.email LIKE CAST(:prefix AS text) || '%'
+    CROSS JOIN LATERAL (
+        SELECT id FROM tags WHERE creator_id = a.creator_id ORDER BY id OFFSET a.id % 6 LIMIT 2
+    ) t
+    """,
+]
+
+
+class StatementRecorder:
+    """Collects the statements the repositories send through the shared engine."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            self.statements.append((statement, parameters))
+
+
+async def seed(conn, users: int, applications: int, folders: int) -> None:
+    params = {"prefix": EMAIL_PREFIX, "users": users, "per_user": applications // users, "folders": folders}
+    for statement in SEED_STATEMENTS:
+        await conn.execute(text(statement), params)
+    for table in ("users", "tags", "statuses", "priorities", "folders", "applications", "application_tags", "folder_status_counts"):
+        await conn.execute(text(f"ANALYZE {table}"))
+
+
+async def summary_status_counts(repo: FolderRepository, user_id, folder_ids):
+    previous = settings.FOLDER_STATUS_COUNTS
+    settings.FOLDER_STATUS_COUNTS = "summary"
+    try:
+        await repo.get_status_counts(user_id, folder_ids, include_unfiled=True)
+    finally:
+        settings.FOLDER_STATUS_COUNTS = previous
+
+
+async def keyset_pages(repo: ApplicationRepository, user_id, **kwargs):
+    _, _, cursor = await repo.search(user_id, limit=20, keyset=True, total_mode="none", **kwargs)
+    await repo.search(user_id, limit=20, cursor=cursor, total_mode="none", **kwargs)
+
+
+async def stream_all(repo: ApplicationRepository, user_id):
+    async for _ in repo.stream_columns(user_id, ["id", "title", "company"], batch_size=500):
+        pass
+
+
+def repository_checks(session: AsyncSession, user_id, folder_id: int, status_id: int, application_id: int):
+    applications = ApplicationRepository(session)
+    folders = FolderRepository(session)
+    selects = SelectsRepository(session)
+    sync = SyncRepository(session)
+    hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    return [
+        ("applications: list by updated_at", lambda: applications.get_all(user_id)),
+        ("applications: list by position", lambda: applications.search(user_id, sort_by="position", sort_order="asc")),
+        ("applications: filter by status", lambda: applications.search(user_id, filters={"status_id": status_id})),
+        ("applications: filter by folder", lambda: applications.search(user_id, filters={"folder_id": folder_id})),
+        ("applications: text search", lambda: applications.search(user_id, query_str="engineer", sort_by="relevance")),
+        ("applications: keyset pages", lambda: keyset_pages(applications, user_id)),
+        ("applications: estimated total", lambda: applications.search(user_id, total_mode="estimate")),
+        ("applications: get by id", lambda: applications.get_by_id(application_id)),
+        ("applications: tag ids", lambda: applications.get_tag_ids([application_id])),
+        ("applications: stream export", lambda: stream_all(applications, user_id)),
+        ("applications: resolve references", lambda: applications.resolve_references(
+            user_id, {"tags": {"Tag 1"}}, {"statuses": {status_id}, "folders": {folder_id}}
+        )),
+        ("folders: list", lambda: folders.get_all(user_id)),
+        ("folders: dashboard", lambda: folders.get_with_recent_applications(user_id, 0, 20)),
+        ("folders: summary status counts", lambda: summary_status_counts(folders, user_id, [folder_id])),
+        ("folders: search", lambda: folders.search(user_id, query_str="Folder 1")),
+        ("folders: keyset search", lambda: folders.search(user_id, keyset=True, limit=10)),
+        ("selects: reference data", lambda: selects.get_reference_data(user_id)),
+        ("sync: applications changed", lambda: sync.get_changed(Application, user_id, hour_ago)),
+        ("sync: folders changed", lambda: sync.get_changed(Folder, user_id, hour_ago)),
+    ]
+
+
+async def sequential_scans(conn, statement: str, parameters) -> set:
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return {
+        node["Relation Name"]
+        for node in iter_plan_nodes(plan[0]["Plan"])
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in CHECKED_TABLES
+    }
+
+
+async def check_indexes(users: int, applications: int, folders: int) -> bool:
+    recorder = StatementRecorder()
+    checks = failures = 0
+    async with engine.connect() as conn:
+        # Everything runs in one transaction that is rolled back, so the database is left as it was
+        transaction = await conn.begin()
+        try:
+            await seed(conn, users, applications, folders)
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            if not await FolderRepository(session).status_counts_trigger_enabled():
+                # outside summary mode nothing maintains the summary; fill it so its query is checked on real data
+                await conn.execute(text("DELETE FROM folder_status_counts"))
+                await conn.execute(REBUILD_FOLDER_STATUS_COUNTS)
+                await conn.execute(text("ANALYZE folder_status_counts"))
+
+            user_id = (await conn.execute(
+                text("SELECT id FROM users WHERE email = :email"), {"email": f"{EMAIL_PREFIX}1@example.com"}
+            )).scalar_one()
+            folder_id = (await session.execute(select(Folder.id).where(Folder.creator_id == user_id).limit(1))).scalar_one()
+            status_id = (await session.execute(select(Status.id).where(Status.creator_id == user_id).limit(1))).scalar_one()
+            application_id = (await session.execute(
+                select(Application.id).where(Application.creator_id == user_id).limit(1)
+            )).scalar_one()
+
+            event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+            try:
+                for name, check in repository_checks(session, user_id, folder_id, status_id, application_id):
+                    checks += 1
+                    recorder.statements = []
+                    await check()
+                    session.expunge_all()
+                    statements = recorder.statements
+
+                    scanned = set()
+                    for statement, parameters in statements:
+                        scanned |= await sequential_scans(conn, statement, parameters)
+                    if scanned:
+                        failures += 1
+                        print(f"FAIL {name}: sequential scan on {', '.join(sorted(scanned))}")
+                    else:
+                        print(f"ok   {name} ({len(statements)} queries)")
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", recorder)
+                await session.close()
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    print(f"{failures} of {checks} checks used a sequential scan")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN every repository query against a seeded dataset and fail on sequential scans "
+                    "(needs a migrated database; the seed data is rolled back)"
+    )
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--applications", type=int, default=100_000)
+    parser.add_argument("--folders", type=int, default=20, help="folders per user")
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(check_indexes(args.users, args.applications, args.folders)) else 1)
@@ -0,0 +1,92 @@
+import argparse
+import random
+import sys
+import os
+
+# Add the parent directory to sys.path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.ordering import keys_between
+from app.services.ordering import place_moves
+
+
+def neighbours(ranks, ids):
+    """What OrderingRepository.get_neighbours returns for `ids`."""
+    stored = sorted(ranks.values())
+    return {
+        item_id: (
+            max((rank for rank in stored if rank < ranks[item_id]), default=None),
+            ranks[item_id],
+            min((rank for rank in stored if rank > ranks[item_id]), default=None),
+        )
+        for item_id in ids
+    }
+
+
+def expected_order(order, moves):
+    """The list after applying the moves one by one."""
+    order = list(order)
+    for move in moves:
+        order.remove(move["id"])
+        if move.get("after_id") is not None:
+            index = order.index(move["after_id"]) + 1
+        else:
+            index = order.index(move["before_id"])
+        order.insert(index, move["id"])
+    return order
+
+
+def check_batch(rng, size):
+    order = rng.sample(range(1, size + 1), size)
+    ranks = dict(zip(order, keys_between(None, None, size)))
+    moves = []
+    for item_id in rng.sample(order, rng.randint(1, size - 1)):
+        neighbour = rng.choice([other for other in order if other != item_id])
+        side = rng.choice(["after_id", "before_id", "both"])
+        if side == "both":
+            # both sides, as a client that read the list after the earlier moves sends them
+            current = expected_order(order, moves)
+            current.remove(item_id)
+            index = current.index(neighbour)
+            move = {"id": item_id, "after_id": neighbour, "before_id": current[index + 1] if index + 1 < len(current) else None}
+        else:
+            move = {"id": item_id, side: neighbour}
+        moves.append(move)
+
+    expected = expected_order(order, moves)
+    named = {move.get(name) for move in moves for name in ("after_id", "before_id")} - {None}
+    placed = [dict(move) for move in moves]
+    keys = place_moves(placed, neighbours(ranks, named))
+    ranks.update({move["id"]: move["rank"] for move in placed})
+
+    if len(set(ranks.values())) != len(ranks):
+        return f"duplicate keys {sorted(ranks.values())}"
+    if sorted(order, key=ranks.get) != expected:
+        return f"got {sorted(order, key=ranks.get)}, expected {expected}"
+    if keys != [move["rank"] for move in placed]:
+        return "returned keys do not match the moves"
+    return None
+
+
+def check_ordering(batches: int, seed: int) -> bool:
+    rng = random.Random(seed)
+    for batch in range(batches):
+        size = rng.randint(2, 10)
+        failure = check_batch(rng, size)
+        if failure:
+            print(f"FAIL batch {batch} (seed {seed}): {failure}")
+            return False
+    print(f"ok   {batches} batches of moves placed in the expected order")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Apply random batches of after_id/before_id moves with place_moves and compare the "
+                    "resulting order with moving list items one by one (no database needed)"
+    )
+    parser.add_argument("--batches", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.exit(0 if check_ordering(args.batches, args.seed) else 1)
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to sys.path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.db.models.folder import (
+    FOLDER_STATUS_COUNTS_FUNCTION,
+    FOLDER_STATUS_COUNTS_TRIGGER,
+    DROP_FOLDER_STATUS_COUNTS_TRIGGER,
+    REBUILD_FOLDER_STATUS_COUNTS,
+)
+
+
+async def enable():
+    """Installs the trigger and backfills folder_status_counts, then summary mode can be turned on."""
+    async with engine.begin() as conn:
+        # blocks application writes (not reads) until the commit, so none is missed between
+        # the backfill and the trigger
+        await conn.execute(text("LOCK TABLE applications IN SHARE ROW EXCLUSIVE MODE"))
+        await conn.execute(FOLDER_STATUS_COUNTS_FUNCTION)
+        await conn.execute(FOLDER_STATUS_COUNTS_TRIGGER)
+        await conn.execute(text("DELETE FROM folder_status_counts"))
+        await conn.execute(REBUILD_FOLDER_STATUS_COUNTS)
+    print("Folder status counts trigger installed and summary rebuilt; set FOLDER_STATUS_COUNTS=summary and restart")
+
+
+async def disable():
+    """Drops the trigger and empties folder_status_counts; run after leaving summary mode."""
+    async with engine.begin() as conn:
+        await conn.execute(DROP_FOLDER_STATUS_COUNTS_TRIGGER)
+        await conn.execute(text("DELETE FROM folder_status_counts"))
+    print("Folder status counts trigger dropped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Switch the trigger-maintained folder_status_counts summary (FOLDER_STATUS_COUNTS=summary) on or off"
+    )
+    parser.add_argument("action", choices=["enable", "disable"])
+    args = parser.parse_args()
+
+    async def main():
+        try:
+            await (enable() if args.action == "enable" else disable())
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
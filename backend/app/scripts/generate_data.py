@@ -0,0 +1,345 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import sys
+import os
+import time
+import uuid
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+# Add the parent directory to sys.path to allow importing 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+
+from app.core.auth import get_password_hash
+from app.core.ordering import keys_between
+from app.db.session import engine, async_session_maker
+from app.db.models.application import Application, application_tags
+from app.db.models.folder import FOLDER_STATUS_COUNTS_TRIGGER_NAME, REBUILD_FOLDER_STATUS_COUNTS
+from app.repositories.folder import FolderRepository
+
+# Every generated date is relative to this, so a seed always produces the same rows
+ANCHOR = datetime(2026, 1, 1, tzinfo=timezone.utc)
+PASSWORD = "pass"
+# users per worker transaction are chosen to give about this many applications
+CHUNK_APPLICATIONS = 100_000
+
+TAG_NAMES = ["Remote", "Hybrid", "On-site", "Python", "React", "FastAPI", "Startup", "FAANG", "Visa Sponsored", "Entry Level"]
+PRIORITY_NAMES = ["Low", "Medium", "High", "Urgent"]
+STATUS_NAMES = ["Wishlist", "Applied", "Phone Screen", "Technical Interview", "On-site", "Offer", "Rejected", "Withdrawn"]
+# relative frequency of each status: most applications are sent and then rejected
+STATUS_WEIGHTS = [15, 30, 12, 8, 4, 2, 25, 4]
+FOLDER_NAMES = ["2024 Job Hunt", "Dream Companies", "Backups", "Internships"]
+COLORS = ["gray", "red", "blue", "green", "yellow", "purple", "orange", "pink", "cyan"]
+
+COMPANIES = ["TechCorp", "Innovate Ltd", "Future Systems", "WebSolutions", "DataMinds", "CloudNine", "SoftServe", "AlphaBit", "OmegaInc", "CyberNet"]
+ROLES = ["Backend Developer", "Frontend Engineer", "Full Stack Developer", "DevOps Engineer", "Data Scientist", "Product Manager", "QA Engineer", "UI/UX Designer"]
+LOCATIONS = ["New York, NY", "San Francisco, CA", "Austin, TX", "Remote", "London, UK", "Berlin, DE"]
+# interview stages after "Applied", in order
+STAGES = [
+    ("Phone Screen", "Intro call with a recruiter."),
+    ("Technical Interview", "Coding interview with the team."),
+    ("On-site", "Final round of interviews."),
+]
+
+DESCRIPTION_TEMPLATE = """We are seeking a talented {role} to join our team at {company}.
+
+Responsibilities:
+- Develop and maintain software applications.
+- Collaborate with cross-functional teams.
+- Write clean, scalable code.
+
+Requirements:
+- Experience with Python, SQL, and Cloud platforms.
+- Strong problem-solving skills.
+- Excellent communication skills."""
+
+DESCRIPTIONS = {(role, company): DESCRIPTION_TEMPLATE.format(role=role, company=company) for role in ROLES for company in COMPANIES}
+NOTES = [f"Referral from a friend. {location} based position. Good work-life balance." for location in LOCATIONS]
+LINKS = [f"https://www.{company.lower().replace(' ', '')}.com/careers/" for company in COMPANIES]
+STATUS_CUMULATIVE = [sum(STATUS_WEIGHTS[:i + 1]) for i in range(len(STATUS_WEIGHTS))]
+# 0 to 3 tags per application
+TAG_SUBSETS = [list(combinations(range(len(TAG_NAMES)), k)) for k in range(4)]
+
+# Dates are drawn as days from the start of the history, so their values can be precomputed.
+# The extra days cover the timeline events and closing dates of the newest applications.
+HISTORY_DAYS = 365
+HISTORY_START = ANCHOR - timedelta(days=HISTORY_DAYS)
+DAYS = [HISTORY_START + timedelta(days=day) for day in range(HISTORY_DAYS + 64)]
+DATES = [day.date() for day in DAYS]
+ISO_DAYS = [day.isoformat() for day in DATES]
+MINUTES = [timedelta(minutes=minute) for minute in range(24 * 60)]
+
+
+def _event(title: str, description: str) -> str:
+    """A timeline entry as JSON, with a %s placeholder for its date."""
+    return json.dumps({"title": title, "date": "%s", "description": description.replace("%", "%%")})
+
+
+# per company: creation, "Applied" and the interview stages in order, and the final event by status
+EVENTS = [
+    [
+        _event("Application Created", "Initial application entry created."),
+        _event("Applied", f"Applied via {company} careers page."),
+        *[_event(title, description) for title, description in STAGES],
+    ]
+    for company in COMPANIES
+]
+OUTCOMES = [
+    {
+        "Offer": _event("Offer", f"Offer received from {company}."),
+        "Rejected": _event("Rejected", "Application rejected."),
+        "Withdrawn": _event("Withdrawn", "Application withdrawn."),
+    }
+    for company in COMPANIES
+]
+
+# COPY order, parents first
+COLUMNS = {
+    "users": ["id", "email", "hashed_password", "is_active", "is_superuser", "is_verified"],
+    "tags": ["id", "title", "color", "creator_id", "updated_at"],
+    "statuses": ["id", "title", "color", "creator_id", "updated_at"],
+    "priorities": ["id", "title", "color", "creator_id", "updated_at"],
+    "folders": ["id", "title", "position", "rank", "creator_id", "created_at", "updated_at"],
+    "applications": [
+        "id", "title", "company", "role", "closing_date", "link", "timeline", "description", "notes", "salary",
+        "position", "rank", "starred", "status_id", "priority_id", "folder_id", "creator_id", "created_at", "updated_at",
+    ],
+    "application_tags": ["application_id", "tag_id"],
+}
+SELECTS = {"tags": TAG_NAMES, "statuses": STATUS_NAMES, "priorities": PRIORITY_NAMES}
+
+RESERVE_IDS = """
+SELECT setval(pg_get_serial_sequence(:table, 'id'), nextval(pg_get_serial_sequence(:table, 'id')) + :count - 1)
+"""
+
+# Fresh loads skip per-row maintenance and catch up once at the end
+DEFERRED_INDEXES = [*Application.__table__.indexes, *application_tags.indexes]
+
+
+@dataclass(frozen=True)
+class Plan:
+    """What to generate; every row is a function of the plan and the user's index."""
+    users: int
+    folders: int
+    # per folder
+    applications: int
+    seed: int
+    email_prefix: str
+    hashed_password: str
+    # first id reserved in each table's sequence
+    first_ids: Dict[str, int]
+
+
+def timeline(status: int, created: int, company: int, r) -> Tuple[str, int]:
+    """(timeline JSON, day of the last event) for an application created on day `created` that reached `status`."""
+    events = EVENTS[company]
+    title = STATUS_NAMES[status]
+    if status == 0:
+        stages = []
+    elif title in ("Rejected", "Withdrawn"):
+        stages = [*events[1:2 + int(r() * (len(STAGES) + 1))], OUTCOMES[company][title]]
+    else:
+        stages = events[1:1 + min(status, 4)]
+        if title == "Offer":
+            stages.append(OUTCOMES[company]["Offer"])
+
+    day = created
+    entries = [events[0] % ISO_DAYS[day]]
+    for event in stages:
+        day += 1 + int(r() * 7)
+        entries.append(event % ISO_DAYS[day])
+    return f"[{', '.join(entries)}]", day
+
+
+def generate_user(plan: Plan, index: int, rows: Dict[str, list], folder_ranks: List[str], application_ranks: List[str]) -> None:
+    """Appends the rows of the `index`th user to `rows`, drawing from a generator seeded by (seed, index)."""
+    rng = random.Random(f"{plan.seed}:{index}")
+    r = rng.random
+    user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+    # titles of tags, statuses and priorities are unique across users
+    number = str(index + 1) if index else ""
+    suffix = f" {number}" if number else ""
+    rows["users"].append((user_id, f"{plan.email_prefix}{number}@example.com", plan.hashed_password, True, False, True))
+
+    select_ids = {}
+    for table, names in SELECTS.items():
+        first = plan.first_ids[table] + index * len(names)
+        select_ids[table] = list(range(first, first + len(names)))
+        rows[table].extend(
+            (first + i, name + suffix, rng.choice(COLORS), user_id, ANCHOR)
+            for i, name in enumerate(names)
+        )
+    tag_ids, status_ids, priority_ids = select_ids["tags"], select_ids["statuses"], select_ids["priorities"]
+
+    applications, tags = rows["applications"], rows["application_tags"]
+    for f in range(plan.folders):
+        folder_id = plan.first_ids["folders"] + index * plan.folders + f
+        title = FOLDER_NAMES[f % len(FOLDER_NAMES)]
+        if plan.folders > len(FOLDER_NAMES):
+            title = f"{title} #{f + 1}"
+        rows["folders"].append((folder_id, title, f, folder_ranks[f], user_id, DAYS[0], DAYS[0]))
+
+        for k in range(plan.applications):
+            n = f * plan.applications + k
+            application_id = plan.first_ids["applications"] + index * plan.folders * plan.applications + n
+            c = int(r() * len(COMPANIES))
+            company, role = COMPANIES[c], ROLES[int(r() * len(ROLES))]
+            status = bisect(STATUS_CUMULATIVE, r() * STATUS_CUMULATIVE[-1])
+            created = int(r() * HISTORY_DAYS)
+            events, updated = timeline(status, created, c, r)
+            minute = MINUTES[int(r() * len(MINUTES))]
+            low = 80 + int(r() * 80)
+            applications.append((
+                application_id, role, company, role,
+                DATES[created + 10 + int(r() * 50)],
+                f"{LINKS[c]}{application_id}",
+                events,
+                DESCRIPTIONS[role, company],
+                NOTES[int(r() * len(NOTES))],
+                f"${low}k - ${low + 20 + int(r() * 60)}k",
+                k, application_ranks[n], r() < 0.1,
+                status_ids[status], priority_ids[int(r() * len(priority_ids))], folder_id, user_id,
+                DAYS[created] + minute, DAYS[updated] + minute,
+            ))
+            subsets = TAG_SUBSETS[int(r() * len(TAG_SUBSETS))]
+            tags.extend((application_id, tag_ids[t]) for t in subsets[int(r() * len(subsets))])
+
+
+async def copy_rows(conn, table: str, rows: list) -> None:
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table, columns=COLUMNS[table], records=rows)
+
+
+async def load_users(plan: Plan, start: int, stop: int) -> None:
+    """Users [start, stop) with everything they own, in one transaction."""
+    folder_ranks = keys_between(None, None, plan.folders)
+    application_ranks = keys_between(None, None, plan.folders * plan.applications)
+    rows: Dict[str, list] = {table: [] for table in COLUMNS}
+    for index in range(start, stop):
+        generate_user(plan, index, rows, folder_ranks, application_ranks)
+
+    async with engine.begin() as conn:
+        # also starts the transaction the COPYs run in
+        await conn.execute(text("SET LOCAL synchronous_commit TO OFF"))
+        for table, table_rows in rows.items():
+            await copy_rows(conn, table, table_rows)
+    print(f"Loaded users {start + 1}-{stop}")
+
+
+def run_chunk(plan: Plan, start: int, stop: int) -> None:
+    """Process pool entry point; each call runs its own event loop, so the engine is disposed after."""
+    async def run():
+        try:
+            await load_users(plan, start, stop)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+async def generate_data(
+    users: int,
+    folders: int,
+    applications: int,
+    seed: int = 0,
+    email_prefix: str = "user",
+    fresh: bool = False,
+    jobs: int = 1,
+) -> None:
+    """Generates `users` users, each with `folders` folders of `applications` applications.
+
+    The same arguments give the same rows (ids aside, which come from the sequences). The first
+    user is "<email_prefix>@example.com", the rest are numbered; all have the password "pass".
+    `fresh` is for empty tables nothing else writes to: indexes on applications are dropped
+    during the load and rebuilt once at the end, and so is the folder status summary when its
+    trigger is installed (FOLDER_STATUS_COUNTS=summary).
+    """
+    started = time.perf_counter()
+    counts = {
+        "tags": users * len(TAG_NAMES),
+        "statuses": users * len(STATUS_NAMES),
+        "priorities": users * len(PRIORITY_NAMES),
+        "folders": users * folders,
+        "applications": users * folders * applications,
+    }
+    first_ids = {}
+    async with engine.begin() as conn:
+        for table, count in counts.items():
+            if count:
+                last = (await conn.execute(text(RESERVE_IDS), {"table": table, "count": count})).scalar_one()
+                first_ids[table] = last - count + 1
+            else:
+                first_ids[table] = 0
+    plan = Plan(users, folders, applications, seed, email_prefix, get_password_hash(PASSWORD), first_ids)
+
+    summary = False
+    if fresh:
+        async with async_session_maker() as session:
+            summary = await FolderRepository(session).status_counts_trigger_enabled()
+        async with engine.begin() as conn:
+            if summary:
+                await conn.execute(text(f"ALTER TABLE applications DISABLE TRIGGER {FOLDER_STATUS_COUNTS_TRIGGER_NAME}"))
+            for index in DEFERRED_INDEXES:
+                await conn.run_sync(index.drop)
+
+    try:
+        per_chunk = max(CHUNK_APPLICATIONS // max(folders * applications, 1), 1)
+        chunks = [(start, min(start + per_chunk, users)) for start in range(0, users, per_chunk)]
+        if jobs > 1:
+            # spawned, so no worker inherits the parent's open connections
+            with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+                loop = asyncio.get_running_loop()
+                await asyncio.gather(*[loop.run_in_executor(pool, run_chunk, plan, start, stop) for start, stop in chunks])
+        else:
+            for start, stop in chunks:
+                await load_users(plan, start, stop)
+    finally:
+        if fresh:
+            async with engine.begin() as conn:
+                await conn.execute(text("SET LOCAL maintenance_work_mem TO '512MB'"))
+                for index in DEFERRED_INDEXES:
+                    await conn.run_sync(index.create)
+                if summary:
+                    await conn.execute(text("DELETE FROM folder_status_counts"))
+                    await conn.execute(REBUILD_FOLDER_STATUS_COUNTS)
+                    await conn.execute(text(f"ALTER TABLE applications ENABLE TRIGGER {FOLDER_STATUS_COUNTS_TRIGGER_NAME}"))
+
+    async with engine.begin() as conn:
+        for table in [*COLUMNS, "folder_status_counts"]:
+            await conn.execute(text(f"ANALYZE {table}"))
+    print(
+        f"Generated {users} users, {counts['folders']} folders and {counts['applications']} applications "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate users with folders, applications, tags and timelines")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--folders", type=int, default=4, help="folders per user")
+    parser.add_argument("--applications", type=int, default=12, help="applications per folder")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--email-prefix", default="user")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--fresh", action="store_true", help="the tables are empty: defer indexes and the counts trigger")
+    args = parser.parse_args()
+
+    async def main():
+        try:
+            await generate_data(
+                args.users, args.folders, args.applications,
+                seed=args.seed, email_prefix=args.email_prefix, fresh=args.fresh, jobs=args.jobs,
+            )
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
@@ -1,21 +1,38 @@
+import argparse
 import asyncio
 import sys
 import os
+from typing import Optional
 
 # Add the parent directory to sys.path to allow importing 'app'
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from app.db.session import engine
 from app.db.base import Base
+from app.scripts.generate_data import generate_data
 from app.scripts.seed_db import seed_db
 
-async def reset_db():
+async def reset_db(
+    users: Optional[int] = None, folders: int = 4, applications: int = 12, seed: int = 0, jobs: int = 1
+):
+    """Recreates the schema, then seeds the demo user, or `users` generated users when given."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     print("Database reset complete")
-    
-    await seed_db()
+
+    if users is None:
+        await seed_db()
+    else:
+        await generate_data(users, folders, applications, seed=seed, fresh=True, jobs=jobs)
 
 if __name__ == "__main__":
-    asyncio.run(reset_db())
+    parser = argparse.ArgumentParser(description="Drop and recreate the database, then seed it")
+    parser.add_argument("--users", type=int, help="generate this many users instead of the demo data")
+    parser.add_argument("--folders", type=int, default=4, help="folders per generated user")
+    parser.add_argument("--applications", type=int, default=12, help="applications per folder")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+
+    asyncio.run(reset_db(args.users, args.folders, args.applications, args.seed, args.jobs))
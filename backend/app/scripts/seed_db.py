@@ -16,11 +16,11 @@ from app.db.models.application import Application
 from app.db.models.selects import Tag, Priority, Status
 from app.core.auth import get_password_hash
 
-async def seed_db():
+async def seed_db(folder_count: int | None = None, email: str = "user@example.com") -> uuid.UUID:
     async with async_session_maker() as session:
         # Create User
         user = User(
-            email="user@example.com",
+            email=email,
             hashed_password=get_password_hash("pass"),
             is_active=True,
             is_superuser=False,
@@ -37,6 +37,9 @@ async def seed_db():
         priority_names = ["Low", "Medium", "High", "Urgent"]
         status_names = ["Wishlist", "Applied", "Phone Screen", "Technical Interview", "On-site", "Offer", "Rejected", "Withdrawn"]
         folder_names = ["2024 Job Hunt", "Dream Companies", "Backups", "Internships"]
+        if folder_count is not None:
+            # Scale the dataset up (e.g. for benchmarks) by cycling through the folder names
+            folder_names = [f"{folder_names[i % len(folder_names)]} #{i + 1}" for i in range(folder_count)]
         
         companies = ["TechCorp", "Innovate Ltd", "Future Systems", "WebSolutions", "DataMinds", "CloudNine", "SoftServe", "AlphaBit", "OmegaInc", "CyberNet"]
         roles = ["Backend Developer", "Frontend Engineer", "Full Stack Developer", "DevOps Engineer", "Data Scientist", "Product Manager", "QA Engineer", "UI/UX Designer"]
@@ -131,5 +134,7 @@ Requirements:
             await session.commit()
             print(f"Created folder {folder.title} with applications")
 
+        return user.id
+
 if __name__ == "__main__":
     asyncio.run(seed_db())
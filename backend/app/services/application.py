@@ -1,18 +1,117 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.repositories.application import ApplicationRepository
-from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationRead
+from app.repositories.pagination import TotalMode
+from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationRead, ApplicationReadBrief, ApplicationBatchUpdate, ApplicationBatchRead
+from app.core.config import settings
+from app.services.selects import SelectsService
+from app.services.sync import SyncService
+from app.services.ordering import OrderingService
 
 from app.db.models.application import Application
 from app.db.models.user import User
 from app.db.models.selects import Tag
-from typing import Literal
+from typing import Any, Dict, List, Literal
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+# ApplicationRead fields read straight off the row; tags/status/priority are resolved from the selects cache
+APPLICATION_COLUMN_FIELDS = [name for name in ApplicationRead.model_fields if name not in ("tags", "status", "priority")]
+RELATED_FIELDS = {"tags": None, "status": "status_id", "priority": "priority_id"}
+
+# brief: ApplicationReadBrief, full: ApplicationRead, custom: the fields listed in `columns`
+Projection = Literal["brief", "full", "custom"]
+FULL_FIELDS = list(ApplicationRead.model_fields)
+BRIEF_FIELDS = list(ApplicationReadBrief.model_fields)
+
+
+def projection_fields(fields: Projection = "full", columns: str | None = None) -> List[str]:
+    """The ApplicationRead field names a projection serializes; `id` is always included."""
+    if fields == "brief":
+        return BRIEF_FIELDS
+    if fields == "full":
+        return FULL_FIELDS
+
+    requested = [name.strip() for name in (columns or "").split(",") if name.strip()]
+    unknown = [name for name in requested if name not in ApplicationRead.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def projection_columns(field_names: List[str]) -> List[str] | None:
+    """Model columns to load for the fields, or None to load everything."""
+    if field_names == FULL_FIELDS:
+        return None
+    columns = []
+    for name in field_names:
+        column = RELATED_FIELDS.get(name, name)
+        if column is not None:
+            columns.append(column)
+    return list(dict.fromkeys(columns))
+
+
+def batch_items(updates: List[BaseModel]) -> List[Dict[str, Any]]:
+    """The fields each batch entry sets, merged per id (later entries win)."""
+    if not updates:
+        raise HTTPException(status_code=400, detail="No updates given")
+    if len(updates) > settings.BATCH_UPDATE_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch is limited to {settings.BATCH_UPDATE_MAX_ITEMS} updates")
+    merged: Dict[int, Dict[str, Any]] = {}
+    for update in updates:
+        merged.setdefault(update.id, {}).update(update.model_dump(exclude_unset=True))
+    return list(merged.values())
+
 
 class ApplicationService:
     def __init__(self, session: AsyncSession):
         self.repo = ApplicationRepository(session)
+        self.sync_service = SyncService(session)
+        self.ordering_service = OrderingService(session)
         self.session = session
 
+    async def serialize_applications(
+        self, applications: List[Application], current_user: User, fields: List[str] | None = None
+    ) -> List[ApplicationRead | ApplicationReadBrief | Dict[str, Any]]:
+        """Serializes into ApplicationRead (default), ApplicationReadBrief or, for custom fields, plain dicts.
+
+        Only reads the attributes the fields need, so it works on rows loaded with `projection_columns`.
+        """
+        fields = fields or FULL_FIELDS
+        tag_ids = await self.repo.get_tag_ids([application.id for application in applications]) if "tags" in fields else {}
+        referenced = {
+            "tags": {tag_id for ids in tag_ids.values() for tag_id in ids},
+            "statuses": {application.status_id for application in applications} if "status" in fields else set(),
+            "priorities": {application.priority_id for application in applications} if "priority" in fields else set(),
+        }
+        selects_service = SelectsService(self.session)
+        reference = await selects_service.get_reference_data(current_user)
+        if any(ids - {item["id"] for item in reference[kind]} - {None} for kind, ids in referenced.items()):
+            # a reference the cached copy does not know yet
+            reference = await selects_service.get_reference_data(current_user, refresh=True)
+        tags = {tag["id"]: tag for tag in reference["tags"]}
+        statuses = {status["id"]: status for status in reference["statuses"]}
+        priorities = {priority["id"]: priority for priority in reference["priorities"]}
+
+        column_fields = [name for name in fields if name not in RELATED_FIELDS]
+        items = []
+        for application in applications:
+            data = {name: getattr(application, name) for name in column_fields}
+            if "tags" in fields:
+                data["tags"] = [tags[tag_id] for tag_id in tag_ids[application.id] if tag_id in tags]
+            if "status" in fields:
+                data["status"] = statuses.get(application.status_id)
+            if "priority" in fields:
+                data["priority"] = priorities.get(application.priority_id)
+
+            if fields == FULL_FIELDS:
+                items.append(ApplicationRead.model_validate(data))
+            elif fields == BRIEF_FIELDS:
+                items.append(ApplicationReadBrief.model_validate(data))
+            else:
+                items.append(data)
+        return items
+
     async def create_application(self, payload: ApplicationCreate, current_user: User) -> ApplicationRead:
         data = payload.model_dump(exclude={"tag_ids"})
         application = Application(**data, creator=current_user, creator_id=current_user.id)
@@ -22,36 +121,77 @@ class ApplicationService:
             tags = result.scalars().all()
             application.tags = list(tags)
         
+        change = await self.sync_service.bump_version(current_user)
+        application.updated_at = change.updated_at
+        # new applications go to the end of the board
+        application.rank = (await self.ordering_service.append_ranks(Application, current_user))[0]
         created_application = await self.repo.create(application)
-        return created_application
+        await self.sync_service.publish(current_user, change, "applications", "created", created_application.id)
+        return (await self.serialize_applications([created_application], current_user))[0]
 
-    async def update_application(self, application_id: int, payload: ApplicationUpdate, current_user: User) -> ApplicationRead:
-        application = await self.repo.verify_ownership(application_id, current_user.id)
+    async def update_application(self, application: Application, payload: ApplicationUpdate, current_user: User) -> ApplicationRead:
+        """`application` comes from the route's `require_owner`, which already checked access."""
+        owner = await self.sync_service.owner_of(application, current_user)
+        change = await self.sync_service.bump_version(owner)
         update_data = payload.model_dump(exclude_unset=True, exclude={"tag_ids"})
-        for key, value in update_data.items():
-            setattr(application, key, value)
-            
         if payload.tag_ids is not None:
-            result = await self.session.execute(select(Tag).where(Tag.id.in_(payload.tag_ids)))
-            tags = result.scalars().all()
-            application.tags = list(tags)
+            await self.repo.replace_tags(application.id, owner.id, payload.tag_ids)
+        # runs even when only the tags change, since updated_at versions the whole payload
+        updated_application = await self.repo.update(application.id, update_data, change.updated_at)
+        fields = list(update_data) + (["tags"] if payload.tag_ids is not None else [])
+        await self.sync_service.publish(owner, change, "applications", "updated", application.id, fields)
+        return (await self.serialize_applications([updated_application], owner))[0]
 
-        updated_application = await self.repo.update(application)
-        return updated_application
+    async def delete_application(self, application: Application, current_user: User) -> None:
+        owner = await self.sync_service.owner_of(application, current_user)
+        change = await self.sync_service.bump_version(owner)
+        await self.sync_service.record_deletion(owner, "applications", application.id, change)
+        await self.repo.delete(application.id)
+        await self.sync_service.publish(owner, change, "applications", "deleted", application.id)
 
-    async def delete_application(self, application_id: int, current_user: User) -> None:
-        application = await self.repo.verify_ownership(application_id, current_user.id)
-        await self.repo.delete(application)
+    async def batch_update_applications(self, payload: ApplicationBatchUpdate, current_user: User) -> List[ApplicationBatchRead]:
+        """Moves, reorders and restatuses many applications in one transaction."""
+        items = batch_items(payload.updates)
+        await self.repo.verify_batch_ownership([item["id"] for item in items], current_user.id)
+
+        # applications may only be moved into the user's own folders and statuses
+        targets = {
+            "folders": {item["folder_id"] for item in items if item.get("folder_id") is not None},
+            "statuses": {item["status_id"] for item in items if item.get("status_id") is not None},
+        }
+        if any(targets.values()):
+            resolved = await self.repo.resolve_references(current_user.id, {}, targets)
+            unknown = [
+                f"{field} {item_id}"
+                for field, kind in (("folder_id", "folders"), ("status_id", "statuses"))
+                for item_id in sorted(targets[kind] - resolved[kind]["ids"])
+            ]
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown {', '.join(unknown)}")
+
+        change = await self.sync_service.bump_version(current_user)
+        await self.ordering_service.assign_ranks(Application, current_user, items, change)
+        rows = await self.repo.batch_update(current_user.id, items, change.updated_at)
+        fields = sorted({name for item in items for name in item if name != "id"})
+        await self.sync_service.publish(
+            current_user, change, "applications", "updated", fields=fields, ids=[row.id for row in rows]
+        )
+        return [ApplicationBatchRead.model_validate(dict(row._mapping)) for row in rows]
 
     async def get_application(self, application_id: int, current_user: User) -> ApplicationRead:
         application = await self.repo.verify_ownership(application_id, current_user.id)
-        return application
+        return (await self.serialize_applications([application], current_user))[0]
 
-    async def list_applications(self, current_user: User, page: int = 1, per_page: int = 10, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc"):
+    async def list_applications(self, current_user: User, page: int = 1, per_page: int = 10, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc", pagination: Literal["offset", "cursor"] = "offset", cursor: str | None = None, total: TotalMode = "exact", fields: Projection = "full", columns: str | None = None):
         # Use search with empty query to get paginated results with total count
-        return await self.search_applications(current_user, query=None, filters=None, page=page, per_page=per_page, sort_by=sort_by, sort_order=sort_order)
+        return await self.search_applications(current_user, query=None, filters=None, page=page, per_page=per_page, sort_by=sort_by, sort_order=sort_order, pagination=pagination, cursor=cursor, total=total, fields=fields, columns=columns)
 
-    async def search_applications(self, current_user: User, query: str | None, filters: dict | None, page: int = 1, per_page: int = 10, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc"):
+    async def search_applications(self, current_user: User, query: str | None, filters: dict | None, page: int = 1, per_page: int = 10, sort_by: str = "updated_at", sort_order: Literal["asc", "desc"] = "desc", pagination: Literal["offset", "cursor"] = "offset", cursor: str | None = None, total: TotalMode = "exact", fields: Projection = "full", columns: str | None = None):
         skip = (page - 1) * per_page
-        applications, total = await self.repo.search(current_user.id, query, filters, skip, per_page, sort_by, sort_order)
-        return {"items": applications, "total": total, "page": page, "per_page": per_page}
+        field_names = projection_fields(fields, columns)
+        applications, total_count, next_cursor = await self.repo.search(
+            current_user.id, query, filters, skip, per_page, sort_by, sort_order,
+            keyset=pagination == "cursor", cursor=cursor, total_mode=total, columns=projection_columns(field_names)
+        )
+        items = await self.serialize_applications(applications, current_user, field_names)
+        return {"items": items, "total": total_count, "page": page, "per_page": per_page, "next_cursor": next_cursor}
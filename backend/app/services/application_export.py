@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.user import User
+from app.db.session import async_session_maker
+from app.repositories.application import ApplicationRepository
+from app.services.selects import SelectsService
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_COLUMNS = [
+    "id", "title", "company", "role", "status_id", "priority_id", "closing_date", "link", "salary",
+    "starred", "position", "folder_id", "description", "notes", "timeline", "created_at", "updated_at",
+]
+# Same names the bulk import accepts, so an export can be imported again
+CSV_HEADER = [
+    "id", "title", "company", "role", "status", "priority", "tags", "closing_date", "link", "salary",
+    "starred", "position", "folder_id", "description", "notes", "timeline", "created_at", "updated_at",
+]
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class ApplicationExportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def export_applications(
+        self, current_user: User, export_format: ExportFormat, query: str | None = None, filters: dict | None = None
+    ) -> AsyncIterator[str]:
+        """Returns the export body as an async iterator of text chunks, one per cursor batch.
+
+        Reference data is loaded up front so failures surface before the response starts.
+        """
+        reference = await SelectsService(self.session).get_reference_data(current_user)
+        titles = {
+            kind: {item["id"]: item["title"] for item in items}
+            for kind, items in reference.items()
+        }
+        return self._stream(current_user, export_format, query, filters, titles)
+
+    async def _stream(
+        self, current_user: User, export_format: ExportFormat, query: str | None, filters: dict | None,
+        titles: Dict[str, Dict[int, str]]
+    ) -> AsyncIterator[str]:
+        # The server-side cursor holds its own connection for as long as the client keeps reading
+        async with async_session_maker() as session:
+            repo = ApplicationRepository(session)
+            if export_format == "csv":
+                yield self._csv_chunk([CSV_HEADER])
+
+            batches = repo.stream_columns(
+                current_user.id, EXPORT_COLUMNS, query, filters, batch_size=settings.EXPORT_BATCH_SIZE
+            )
+            async for rows in batches:
+                records = [self._record(row, titles) for row in rows]
+                if export_format == "csv":
+                    yield self._csv_chunk([self._csv_row(record) for record in records])
+                else:
+                    yield "".join(json.dumps(record, default=_json_default) + "\n" for record in records)
+
+    def _record(self, row: Any, titles: Dict[str, Dict[int, str]]) -> Dict[str, Any]:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        tag_ids = row.tag_ids or []
+        record["status"] = titles["statuses"].get(record.pop("status_id"))
+        record["priority"] = titles["priorities"].get(record.pop("priority_id"))
+        record["tags"] = [titles["tags"][tag_id] for tag_id in tag_ids if tag_id in titles["tags"]]
+        return record
+
+    def _csv_row(self, record: Dict[str, Any]) -> List[Any]:
+        values = dict(record)
+        values["tags"] = ";".join(record["tags"])
+        values["timeline"] = json.dumps(record["timeline"]) if record["timeline"] is not None else None
+        return [values[name] for name in CSV_HEADER]
+
+    def _csv_chunk(self, rows: List[List[Optional[Any]]]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
@@ -0,0 +1,211 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Literal, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.models.application import Application
+from app.db.models.user import User
+from app.repositories.application import ApplicationRepository
+from app.schemas.application import ApplicationCreate
+from app.services.ordering import OrderingService
+from app.services.sync import SyncService
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# Columns that name a related row instead of giving its id
+REFERENCE_FIELDS = {"tags": "tags", "status": "statuses", "priority": "priorities", "folder": "folders"}
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decodes a byte stream into lines (newlines kept), holding at most one partial line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any] | ValueError]:
+    """CSV records as dicts keyed by the header row.
+
+    A record is complete once it holds an even number of quote characters, so quoted
+    fields spanning several lines (descriptions, notes) are read as one record.
+    """
+    header = None
+    record = ""
+    async for line in lines:
+        record += line
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]), [])
+        record = ""
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) > len(header):
+            yield ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        # empty cells are missing values, not empty strings
+        yield {name: value for name, value in zip(header, values) if value != ""}
+    if record.strip():
+        yield ValueError("Unterminated quoted field")
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any] | ValueError]:
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+            continue
+        yield row if isinstance(row, dict) else ValueError("Expected a JSON object")
+
+
+def _split_names(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(name).strip() for name in value if str(name).strip()]
+    return [name.strip() for name in str(value).split(";") if name.strip()]
+
+
+def _prepare_row(row: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """Splits a raw row into ApplicationCreate input and the related-row names it references."""
+    data = dict(row)
+    names = {field: _split_names(data.pop(field)) for field in REFERENCE_FIELDS if field in data}
+    if isinstance(data.get("tag_ids"), str):
+        data["tag_ids"] = [tag_id.strip() for tag_id in data["tag_ids"].split(";") if tag_id.strip()]
+    if isinstance(data.get("timeline"), str):
+        data["timeline"] = json.loads(data["timeline"])
+    return data, names
+
+
+class ApplicationImportService:
+    def __init__(self, session: AsyncSession):
+        self.repo = ApplicationRepository(session)
+        self.sync_service = SyncService(session)
+        self.ordering_service = OrderingService(session)
+        self.session = session
+
+    async def import_applications(
+        self, chunks: AsyncIterator[bytes], import_format: ImportFormat, current_user: User
+    ) -> Dict[str, Any]:
+        lines = iter_lines(chunks)
+        rows = iter_csv_rows(lines) if import_format == "csv" else iter_ndjson_rows(lines)
+
+        report = {"inserted": 0, "failed": 0, "errors": []}
+        batch: List[Tuple[int, Dict[str, Any] | ValueError]] = []
+        row_number = 0
+        async for row in rows:
+            row_number += 1
+            if row_number > settings.BULK_IMPORT_MAX_ROWS:
+                report["errors"].append({"row": row_number, "errors": [f"Import is limited to {settings.BULK_IMPORT_MAX_ROWS} rows"]})
+                report["failed"] += 1
+                break
+            batch.append((row_number, row))
+            if len(batch) >= settings.BULK_IMPORT_CHUNK_SIZE:
+                await self._import_chunk(batch, current_user, report)
+                batch = []
+        if batch:
+            await self._import_chunk(batch, current_user, report)
+
+        return report
+
+    async def _import_chunk(
+        self, batch: List[Tuple[int, Dict[str, Any] | ValueError]], current_user: User, report: Dict[str, Any]
+    ) -> None:
+        # Validate every row before touching the database
+        valid: List[Tuple[int, ApplicationCreate, Dict[str, List[str]]]] = []
+        errors: List[Dict[str, Any]] = []
+        for row_number, row in batch:
+            if isinstance(row, ValueError):
+                errors.append({"row": row_number, "errors": [str(row)]})
+                continue
+            try:
+                data, names = _prepare_row(row)
+                valid.append((row_number, ApplicationCreate.model_validate(data), names))
+            except ValidationError as e:
+                errors.append({"row": row_number, "errors": e.errors(include_url=False, include_context=False, include_input=False)})
+            except ValueError as e:
+                errors.append({"row": row_number, "errors": [str(e)]})
+
+        # One lookup for every title and id the chunk references
+        titles = {kind: set() for kind in REFERENCE_FIELDS.values()}
+        ids = {kind: set() for kind in REFERENCE_FIELDS.values()}
+        for _, payload, names in valid:
+            for field, kind in REFERENCE_FIELDS.items():
+                titles[kind].update(names.get(field, []))
+            ids["tags"].update(payload.tag_ids or [])
+            ids["statuses"].add(payload.status_id)
+            ids["priorities"].add(payload.priority_id)
+            ids["folders"].add(payload.folder_id)
+        for kind_ids in ids.values():
+            kind_ids.discard(None)
+        resolved = await self.repo.resolve_references(current_user.id, titles, ids)
+
+        rows: List[Dict[str, Any]] = []
+        tag_ids: List[List[int]] = []
+        inserted_rows: List[int] = []
+        for row_number, payload, names in valid:
+            row_errors = []
+            data = payload.model_dump(exclude={"tag_ids"})
+            row_tag_ids = list(payload.tag_ids or [])
+            for field, kind in REFERENCE_FIELDS.items():
+                for name in names.get(field, []):
+                    if name not in resolved[kind]["titles"]:
+                        row_errors.append(f"Unknown {field} '{name}'")
+                    elif field == "tags":
+                        row_tag_ids.append(resolved[kind]["titles"][name])
+                    else:
+                        data[f"{field}_id"] = resolved[kind]["titles"][name]
+            for tag_id in row_tag_ids:
+                if tag_id not in resolved["tags"]["ids"]:
+                    row_errors.append(f"Unknown tag_id {tag_id}")
+            for field, kind in (("status", "statuses"), ("priority", "priorities"), ("folder", "folders")):
+                if data[f"{field}_id"] is not None and data[f"{field}_id"] not in resolved[kind]["ids"]:
+                    row_errors.append(f"Unknown {field}_id {data[f'{field}_id']}")
+
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+                continue
+            rows.append({**data, "creator_id": current_user.id})
+            tag_ids.append(list(dict.fromkeys(row_tag_ids)))
+            inserted_rows.append(row_number)
+
+        try:
+            if rows:
+                change = await self.sync_service.bump_version(current_user)
+                ranks = await self.ordering_service.append_ranks(Application, current_user, len(rows))
+                for row, rank in zip(rows, ranks):
+                    row["updated_at"] = change.updated_at
+                    row["rank"] = rank
+            await self.repo.bulk_create(rows, tag_ids)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            # the database error can quote other rows' values and schema details; it stays in the log
+            logger.warning(
+                f"Could not insert {len(rows)} imported applications: {e!r}", extra={"user_id": str(current_user.id)}
+            )
+            errors.extend({"row": row_number, "errors": ["Could not insert the row"]} for row_number in inserted_rows)
+            inserted_rows = []
+        if inserted_rows:
+            # one event per chunk; clients pick the rows up through /sync/changes
+            await self.sync_service.publish(current_user, change, "applications", "imported")
+
+        report["inserted"] += len(inserted_rows)
+        report["failed"] += len(errors)
+        report["errors"].extend(sorted(errors, key=lambda error: error["row"]))
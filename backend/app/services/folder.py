@@ -1,45 +1,126 @@
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Literal
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.folder import FolderRepository
-from app.schemas.folder import FolderCreate, FolderUpdate, FolderRead, FolderWithRecentApplications
+from app.repositories.pagination import TotalMode
+from app.schemas.folder import FolderCreate, FolderUpdate, FolderRead, FolderWithRecentApplications, FolderBatchUpdate, FolderBatchRead
 from app.db.models.folder import Folder
 from app.db.models.user import User
+from app.services.application import ApplicationService, Projection, projection_fields, projection_columns, batch_items
+from app.services.selects import SelectsService
+from app.services.sync import SyncService
+from app.services.ordering import OrderingService
+
+UNASSIGNED_STATUS = "Unassigned"
 
 class FolderService:
     def __init__(self, session: AsyncSession):
         self.repo = FolderRepository(session)
+        self.application_service = ApplicationService(session)
+        self.selects_service = SelectsService(session)
+        self.sync_service = SyncService(session)
+        self.ordering_service = OrderingService(session)
+
+    async def _status_titles(self, current_user: User, status_ids: Iterable[Optional[int]] = ()) -> Dict[int, str]:
+        """Status titles by id, reloaded when the cached copy is missing one of `status_ids`."""
+        reference = await self.selects_service.get_reference_data(current_user)
+        titles = {status["id"]: status["title"] for status in reference["statuses"]}
+        if set(status_ids) - titles.keys() - {None}:
+            reference = await self.selects_service.get_reference_data(current_user, refresh=True)
+            titles = {status["id"]: status["title"] for status in reference["statuses"]}
+        return titles
+
+    def _titled_counts(self, by_status: Dict[Optional[int], int], titles: Dict[int, str]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for status_id, count in by_status.items():
+            title = titles.get(status_id, UNASSIGNED_STATUS)
+            counts[title] = counts.get(title, 0) + count
+        return counts
+
+    async def with_counts(self, folders: List[Folder], current_user: User) -> List[FolderRead]:
+        """FolderRead with application totals and per-status counts, from one aggregate for all folders."""
+        status_counts = await self.repo.get_status_counts(current_user.id, [folder.id for folder in folders])
+        titles = await self._status_titles(current_user, [status_id for counts in status_counts.values() for status_id in counts])
+        return [
+            FolderRead.model_validate(folder).model_copy(update={
+                "count": sum(status_counts.get(folder.id, {}).values()),
+                "counts_per_status": self._titled_counts(status_counts.get(folder.id, {}), titles),
+            })
+            for folder in folders
+        ]
 
     async def create_folder(self, payload: FolderCreate, current_user: User) -> FolderRead:
-        folder = Folder(**payload.model_dump(), creator=current_user, creator_id=current_user.id)
+        change = await self.sync_service.bump_version(current_user)
+        rank = (await self.ordering_service.append_ranks(Folder, current_user))[0]
+        folder = Folder(**payload.model_dump(), creator=current_user, creator_id=current_user.id, updated_at=change.updated_at, rank=rank)
         created_folder = await self.repo.create(folder)
+        await self.sync_service.publish(current_user, change, "folders", "created", created_folder.id)
         return created_folder
 
-    async def update_folder(self, folder_id: int, payload: FolderUpdate, current_user: User) -> FolderRead:
-        folder = await self.repo.verify_ownership(folder_id, current_user.id)
+    async def update_folder(self, folder: Folder, payload: FolderUpdate, current_user: User) -> FolderRead:
+        """`folder` comes from the route's `require_owner`, which already checked access."""
+        owner = await self.sync_service.owner_of(folder, current_user)
+        change = await self.sync_service.bump_version(owner)
         update_data = payload.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(folder, key, value)
-        updated_folder = await self.repo.update(folder)
-        return updated_folder
+        updated_folder = await self.repo.update(folder.id, update_data, change.updated_at)
+        await self.sync_service.publish(owner, change, "folders", "updated", folder.id, list(update_data))
+        return (await self.with_counts([updated_folder], owner))[0]
 
-    async def delete_folder(self, folder_id: int, current_user: User) -> None:
-        folder = await self.repo.verify_ownership(folder_id, current_user.id)
-        await self.repo.delete(folder)
+    async def delete_folder(self, folder: Folder, current_user: User) -> None:
+        owner = await self.sync_service.owner_of(folder, current_user)
+        change = await self.sync_service.bump_version(owner)
+        # deleting a folder unfiles its applications
+        await self.application_service.repo.touch_referencing(owner.id, "folder_id", folder.id, change.updated_at)
+        await self.sync_service.record_deletion(owner, "folders", folder.id, change)
+        await self.repo.delete(folder.id)
+        await self.sync_service.publish(owner, change, "folders", "deleted", folder.id)
+
+    async def batch_update_folders(self, payload: FolderBatchUpdate, current_user: User) -> List[FolderBatchRead]:
+        """Reorders many folders in one transaction."""
+        items = batch_items(payload.updates)
+        await self.repo.verify_batch_ownership([item["id"] for item in items], current_user.id)
+        change = await self.sync_service.bump_version(current_user)
+        await self.ordering_service.assign_ranks(Folder, current_user, items, change)
+        rows = await self.repo.batch_update(current_user.id, items, change.updated_at)
+        fields = sorted({name for item in items for name in item if name != "id"})
+        await self.sync_service.publish(
+            current_user, change, "folders", "updated", fields=fields, ids=[row.id for row in rows]
+        )
+        return [FolderBatchRead.model_validate(dict(row._mapping)) for row in rows]
 
     async def get_folder(self, folder_id: int, current_user: User) -> FolderRead:
         folder = await self.repo.verify_ownership(folder_id, current_user.id)
-        return folder
+        return (await self.with_counts([folder], current_user))[0]
 
-    async def list_folders_recent_applications(self, current_user: User, page: int = 1, per_page: int = 10):
+    async def list_folders_recent_applications(self, current_user: User, page: int = 1, per_page: int = 10, fields: Projection = "full", columns: str | None = None):
         skip = (page - 1) * per_page
-        data, total = await self.repo.get_with_recent_applications(current_user.id, skip, per_page)
-        
+        field_names = projection_fields(fields, columns)
+        data, total = await self.repo.get_with_recent_applications(
+            current_user.id, skip, per_page, columns=projection_columns(field_names)
+        )
+
+        # Serialize every folder's applications in one batch
+        serialized = await self.application_service.serialize_applications(
+            [application for _, applications, _, _ in data for application in applications], current_user, field_names
+        )
+        serialized_by_id = {
+            (item["id"] if isinstance(item, dict) else item.id): item for item in serialized
+        }
+
+        titles = await self._status_titles(current_user, [status_id for *_, by_status in data for status_id in by_status])
+
         result = []
-        for folder, applications, count in data:
+        for folder, applications, count, by_status in data:
+            counts_per_status = self._titled_counts(by_status, titles)
+            folder_read = None
+            if folder is not None:
+                folder_read = FolderRead.model_validate(folder).model_copy(
+                    update={"count": count, "counts_per_status": counts_per_status}
+                )
             result.append(FolderWithRecentApplications(
-                folder=folder,
-                recent_applications=applications,
-                application_count=count
+                folder=folder_read,
+                recent_applications=[serialized_by_id[application.id] for application in applications],
+                application_count=count,
+                counts_per_status=counts_per_status
             ))
         return {"items": result, "total": total, "page": page, "per_page": per_page}
 
@@ -50,7 +131,11 @@ class FolderService:
         # For now, returning list.
         return folders
 
-    async def search_folders(self, current_user: User, query: str | None, filters: dict | None, page: int = 1, per_page: int = 10):
+    async def search_folders(self, current_user: User, query: str | None, filters: dict | None, page: int = 1, per_page: int = 10, pagination: Literal["offset", "cursor"] = "offset", cursor: str | None = None, total: TotalMode = "exact"):
         skip = (page - 1) * per_page
-        folders, total = await self.repo.search(current_user.id, query, filters, skip, per_page)
-        return {"items": folders, "total": total, "page": page, "per_page": per_page}
+        folders, total_count, next_cursor = await self.repo.search(
+            current_user.id, query, filters, skip, per_page,
+            keyset=pagination == "cursor", cursor=cursor, total_mode=total
+        )
+        items = await self.with_counts(folders, current_user)
+        return {"items": items, "total": total_count, "page": page, "per_page": per_page, "next_cursor": next_cursor}
@@ -0,0 +1,139 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
+from fastapi import HTTPException
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.ordering import key_between, keys_between
+from app.db.base import Base
+from app.db.models.application import Application
+from app.db.models.folder import Folder
+from app.db.models.user import User
+from app.db.session import async_session_maker
+from app.repositories.ordering import OrderingRepository
+from app.services.sync import SyncService
+
+KINDS = {Application: "applications", Folder: "folders"}
+
+# (table, user id) pairs with a rebalance queued or running in this worker
+_rebalancing: Set[Tuple[str, Any]] = set()
+_tasks: Set[asyncio.Task] = set()
+
+
+class OrderingService:
+    def __init__(self, session: AsyncSession):
+        self.repo = OrderingRepository(session)
+        self.sync_service = SyncService(session)
+        self.session = session
+
+    async def append_ranks(self, model: Type[Base], current_user: User, n: int = 1) -> List[str]:
+        """Keys for `n` new rows after the user's last one.
+
+        Call after `bump_version`: its row lock keeps concurrent appends from picking the same key.
+        """
+        keys = keys_between(await self.repo.last_rank(model, current_user.id), None, n)
+        self._check_length(model, current_user, keys)
+        return keys
+
+    async def assign_ranks(self, model: Type[Base], current_user: User, items: List[Dict[str, Any]], change: Row) -> None:
+        """Replaces `after_id`/`before_id` on batch items with a `rank` between those neighbours.
+
+        Giving only one places the item right next to it. Items are placed in order, so one can
+        be dropped next to another moved earlier in the same batch.
+        """
+        moves = [item for item in items if "after_id" in item or "before_id" in item]
+        if not moves:
+            return
+        for item in moves:
+            if item.get("after_id") is None and item.get("before_id") is None:
+                raise HTTPException(status_code=400, detail="A move needs after_id or before_id")
+            if item["id"] in (item.get("after_id"), item.get("before_id")):
+                raise HTTPException(status_code=400, detail="An item cannot be its own neighbour")
+        neighbour_ids = {item.get(name) for item in moves for name in ("after_id", "before_id")} - {None}
+        neighbours = await self.repo.get_neighbours(model, current_user.id, neighbour_ids)
+        unknown = sorted(neighbour_ids - neighbours.keys())
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown neighbour ids: {', '.join(map(str, unknown))}")
+        if any(neighbours[item_id][1] is None for item_id in neighbour_ids):
+            # rows from before ordering keys existed get theirs first
+            await self.repo.rebalance(model, current_user.id, change.updated_at)
+            neighbours = await self.repo.get_neighbours(model, current_user.id, neighbour_ids)
+
+        try:
+            keys = place_moves(moves, neighbours)
+        except ValueError:
+            # neighbours out of order or sharing a key: a concurrent move got there first
+            schedule_rebalance(model, current_user)
+            raise HTTPException(status_code=409, detail="The neighbours have moved, refresh and try again")
+        self._check_length(model, current_user, keys)
+
+    def _check_length(self, model: Type[Base], current_user: User, keys: List[str]) -> None:
+        if any(len(key) > settings.RANK_REBALANCE_LENGTH for key in keys):
+            schedule_rebalance(model, current_user)
+
+    async def rebalance(self, model: Type[Base], current_user: User) -> int:
+        """Renumbers the user's keys in their own transaction; rows are stamped for delta sync."""
+        change = await self.sync_service.bump_version(current_user)
+        count = await self.repo.rebalance(model, current_user.id, change.updated_at)
+        await self.session.commit()
+        await self.sync_service.publish(current_user, change, KINDS[model], "rebalanced")
+        return count
+
+
+def place_moves(
+    moves: List[Dict[str, Any]], neighbours: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]]
+) -> List[str]:
+    """Pops `after_id`/`before_id` from each move and sets its `rank`, in order; returns the keys.
+
+    `neighbours` holds (previous, rank, next) of every named neighbour as stored. A side left out
+    is the named neighbour's adjacent row, counting the rows placed so far; a row that moved away
+    still bounds its old slot, which only narrows the gap. Raises ValueError when two given
+    neighbours are out of order.
+    """
+    ranks = {item_id: rank for item_id, (_, rank, _) in neighbours.items()}
+    adjacent = {item_id: (previous, following) for item_id, (previous, _, following) in neighbours.items()}
+    placed: List[str] = []
+    for item in moves:
+        after_id, before_id = item.pop("after_id", None), item.pop("before_id", None)
+        after = ranks[after_id] if after_id is not None else None
+        before = ranks[before_id] if before_id is not None else None
+        if before_id is None:
+            bounds = [adjacent[after_id][1]] + [key for key in placed if key > after]
+            before = min((key for key in bounds if key is not None), default=None)
+        if after_id is None:
+            bounds = [adjacent[before_id][0]] + [key for key in placed if key < before]
+            after = max((key for key in bounds if key is not None), default=None)
+        item["rank"] = key_between(after, before)
+        # a placed row's own neighbours: nothing but rows placed later can come between them
+        ranks[item["id"]] = item["rank"]
+        adjacent[item["id"]] = (after, before)
+        placed.append(item["rank"])
+    return placed
+
+
+def schedule_rebalance(model: Type[Base], current_user: User) -> None:
+    """Queues a rebalance after the current request, at most one per user and table at a time.
+
+    It waits on the user's version lock, so it starts once the triggering write has committed.
+    """
+    key = (model.__tablename__, current_user.id)
+    if key in _rebalancing:
+        return
+    _rebalancing.add(key)
+    task = asyncio.get_running_loop().create_task(_rebalance(model, current_user, key))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _rebalance(model: Type[Base], current_user: User, key: Tuple[str, Any]) -> None:
+    try:
+        async with async_session_maker() as session:
+            count = await OrderingService(session).rebalance(model, current_user)
+        logger.info(f"Rebalanced {count} {model.__tablename__} ordering keys", extra={"user_id": str(current_user.id)})
+    except Exception as e:
+        logger.warning(f"Could not rebalance {model.__tablename__} ordering keys: {e!r}")
+    finally:
+        _rebalancing.discard(key)
@@ -1,23 +1,55 @@
-from typing import List
+from typing import Dict, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.selects import SelectsRepository
+from app.repositories.application import ApplicationRepository
 from app.schemas.selects import SelectCreate, SelectUpdate, SelectRead
 from app.db.models.selects import Tag, Status, Priority
 from app.db.models.user import User
+from app.core.cache import selects_cache
+from sqlalchemy.engine import Row
+from app.services.sync import SyncService
 
 class SelectsService:
     def __init__(self, session: AsyncSession):
         self.repo = SelectsRepository(session)
+        self.sync_service = SyncService(session)
+        self.application_repo = ApplicationRepository(session)
+
+    async def get_reference_data(self, current_user: User, refresh: bool = False) -> Dict[str, List[dict]]:
+        """Tags, statuses and priorities for the user, served from the shared cache for their data version.
+
+        `refresh` reloads it, for a caller that found an id the cached copy does not have.
+        """
+        version = await self.sync_service.get_version(current_user)
+        return await selects_cache.get(
+            current_user.id, version, lambda: self.repo.get_reference_data(current_user.id), refresh=refresh
+        )
+
+    async def _record_deletion(self, current_user: User, kind: str, column: str, item_id: int) -> Row:
+        # applications lose the reference through the foreign key, so they are stamped as changed too
+        change = await self.sync_service.bump_version(current_user)
+        await self.application_repo.touch_referencing(current_user.id, column, item_id, change.updated_at)
+        await self.sync_service.record_deletion(current_user, kind, item_id, change)
+        return change
 
     # Tag
     async def create_tag(self, payload: SelectCreate, current_user: User) -> SelectRead:
-        return await self.repo.create(Tag, user_id=current_user.id, **payload.model_dump())
+        change = await self.sync_service.bump_version(current_user)
+        tag = await self.repo.create(Tag, user_id=current_user.id, updated_at=change.updated_at, **payload.model_dump())
+        await self.sync_service.publish(current_user, change, "tags", "created", tag.id)
+        return tag
 
     async def update_tag(self, tag_id: int, payload: SelectUpdate, current_user: User) -> SelectRead:
-        return await self.repo.update(Tag, tag_id, current_user.id, **payload.model_dump(exclude_unset=True))
+        change = await self.sync_service.bump_version(current_user)
+        update_data = payload.model_dump(exclude_unset=True)
+        tag = await self.repo.update(Tag, tag_id, current_user.id, updated_at=change.updated_at, **update_data)
+        await self.sync_service.publish(current_user, change, "tags", "updated", tag_id, list(update_data))
+        return tag
 
     async def delete_tag(self, tag_id: int, current_user: User) -> None:
+        change = await self._record_deletion(current_user, "tags", "tag_id", tag_id)
         await self.repo.delete(Tag, tag_id, current_user.id)
+        await self.sync_service.publish(current_user, change, "tags", "deleted", tag_id)
 
     async def list_tags(self, current_user: User, page: int = 1, per_page: int = 10) -> List[SelectRead]:
         skip = (page - 1) * per_page
@@ -25,13 +57,22 @@ class SelectsService:
 
     # Status
     async def create_status(self, payload: SelectCreate, current_user: User) -> SelectRead:
-        return await self.repo.create(Status, user_id=current_user.id, **payload.model_dump())
+        change = await self.sync_service.bump_version(current_user)
+        status = await self.repo.create(Status, user_id=current_user.id, updated_at=change.updated_at, **payload.model_dump())
+        await self.sync_service.publish(current_user, change, "statuses", "created", status.id)
+        return status
 
     async def update_status(self, status_id: int, payload: SelectUpdate, current_user: User) -> SelectRead:
-        return await self.repo.update(Status, status_id, current_user.id, **payload.model_dump(exclude_unset=True))
+        change = await self.sync_service.bump_version(current_user)
+        update_data = payload.model_dump(exclude_unset=True)
+        status = await self.repo.update(Status, status_id, current_user.id, updated_at=change.updated_at, **update_data)
+        await self.sync_service.publish(current_user, change, "statuses", "updated", status_id, list(update_data))
+        return status
 
     async def delete_status(self, status_id: int, current_user: User) -> None:
+        change = await self._record_deletion(current_user, "statuses", "status_id", status_id)
         await self.repo.delete(Status, status_id, current_user.id)
+        await self.sync_service.publish(current_user, change, "statuses", "deleted", status_id)
 
     async def list_statuses(self, current_user: User, page: int = 1, per_page: int = 10) -> List[SelectRead]:
         skip = (page - 1) * per_page
@@ -39,13 +80,22 @@ class SelectsService:
 
     # Priority
     async def create_priority(self, payload: SelectCreate, current_user: User) -> SelectRead:
-        return await self.repo.create(Priority, user_id=current_user.id, **payload.model_dump())
+        change = await self.sync_service.bump_version(current_user)
+        priority = await self.repo.create(Priority, user_id=current_user.id, updated_at=change.updated_at, **payload.model_dump())
+        await self.sync_service.publish(current_user, change, "priorities", "created", priority.id)
+        return priority
 
     async def update_priority(self, priority_id: int, payload: SelectUpdate, current_user: User) -> SelectRead:
-        return await self.repo.update(Priority, priority_id, current_user.id, **payload.model_dump(exclude_unset=True))
+        change = await self.sync_service.bump_version(current_user)
+        update_data = payload.model_dump(exclude_unset=True)
+        priority = await self.repo.update(Priority, priority_id, current_user.id, updated_at=change.updated_at, **update_data)
+        await self.sync_service.publish(current_user, change, "priorities", "updated", priority_id, list(update_data))
+        return priority
 
     async def delete_priority(self, priority_id: int, current_user: User) -> None:
+        change = await self._record_deletion(current_user, "priorities", "priority_id", priority_id)
         await self.repo.delete(Priority, priority_id, current_user.id)
+        await self.sync_service.publish(current_user, change, "priorities", "deleted", priority_id)
 
     async def list_priorities(self, current_user: User, page: int = 1, per_page: int = 10) -> List[SelectRead]:
         skip = (page - 1) * per_page
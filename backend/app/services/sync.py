@@ -0,0 +1,52 @@
+from datetime import timedelta
+from typing import Any, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
+from app.core.config import settings
+from app.core.events import broker
+from app.repositories.sync import SyncRepository
+from app.db.models.user import User
+
+
+class SyncService:
+    def __init__(self, session: AsyncSession):
+        self.repo = SyncRepository(session)
+        self.session = session
+
+    async def owner_of(self, resource: Any, current_user: User) -> User:
+        """Whose data `resource` is: the current user, or its creator when a superuser acts on it."""
+        if resource.creator_id == current_user.id:
+            return current_user
+        return await self.session.get(User, resource.creator_id)
+
+    async def get_version(self, current_user: User) -> int:
+        return await self.repo.get_version(current_user.id)
+
+    async def bump_version(self, current_user: User) -> Row:
+        """Call before the write's commit, so the new version and the change become visible together.
+
+        Returns `version` and `updated_at`; the write stamps every row it touches with that `updated_at`.
+        """
+        return await self.repo.bump_version(current_user.id)
+
+    async def record_deletion(self, current_user: User, kind: str, item_id: int, change: Row) -> None:
+        """Leaves a tombstone for delta sync; `change` is the bump of the deleting transaction."""
+        await self.repo.add_tombstone(current_user.id, kind, item_id, change.updated_at)
+        await self.repo.prune_tombstones(
+            current_user.id, change.updated_at - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        )
+
+    async def publish(
+        self, current_user: User, change: Row, kind: str, action: str,
+        item_id: Optional[int] = None, fields: Optional[List[str]] = None, ids: Optional[List[int]] = None,
+    ) -> None:
+        """Pushes a change event to the user's open event streams. Call after the commit.
+
+        Batch writes pass `ids` instead of `item_id`.
+        """
+        event = {"kind": kind, "action": action, "id": item_id, "version": change.version}
+        if fields is not None:
+            event["fields"] = fields
+        if ids is not None:
+            event["ids"] = ids
+        await broker.publish(current_user.id, event)
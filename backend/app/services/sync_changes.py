@@ -0,0 +1,57 @@
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.sync import SyncRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
+from app.schemas.sync import SyncChanges
+from app.db.models.application import Application
+from app.db.models.folder import Folder
+from app.db.models.selects import Tag, Status, Priority
+from app.db.models.user import User
+from app.services.application import ApplicationService
+from app.services.folder import FolderService
+
+SELECT_KINDS = {"tags": Tag, "statuses": Status, "priorities": Priority}
+
+
+class SyncChangesService:
+    def __init__(self, session: AsyncSession):
+        self.repo = SyncRepository(session)
+        self.application_service = ApplicationService(session)
+        self.folder_service = FolderService(session)
+
+    def _decode_token(self, token: str) -> datetime:
+        since = decode_cursor(token, 1)[0]
+        if not isinstance(since, datetime):
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+        return since
+
+    async def get_changes(self, current_user: User, since: str | None = None) -> SyncChanges:
+        """Everything written after the `since` token (everything at all without one), plus deleted ids.
+
+        Writes stamp their rows under the user's version lock, so a row committed after this read
+        always has a later `updated_at` than the token handed out here.
+        """
+        since_at = self._decode_token(since) if since else None
+        # read before the rows: a write committing in between is sent now and again next time, never lost
+        state = await self.repo.get_state(current_user.id)
+        if since_at is not None and state is not None and state.tombstones_pruned_before is not None \
+                and since_at < state.tombstones_pruned_before:
+            raise HTTPException(status_code=410, detail="Sync token expired, fetch everything again without `since`")
+
+        applications = await self.repo.get_changed(Application, current_user.id, since_at)
+        folders = await self.repo.get_changed(Folder, current_user.id, since_at)
+        selects = {kind: await self.repo.get_changed(model, current_user.id, since_at) for kind, model in SELECT_KINDS.items()}
+        deleted = await self.repo.get_tombstones(current_user.id, since_at) if since_at is not None else {}
+
+        if state is not None and state.updated_at is not None:
+            token = encode_cursor([state.updated_at])
+        else:
+            token = since
+        return SyncChanges(
+            token=token,
+            applications=await self.application_service.serialize_applications(applications, current_user),
+            folders=await self.folder_service.with_counts(folders, current_user),
+            deleted=deleted,
+            **selects,
+        )
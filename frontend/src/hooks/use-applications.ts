@@ -17,22 +17,26 @@ export interface Application {
     updated_at: string;
 }
 
+// "exact" recounts on every request; callers that don't show the total can pass "none",
+// and "cached" reuses an exact count until the user's data changes
+export type TotalMode = "exact" | "none" | "estimate" | "cached";
+
 export interface ApplicationsResponse {
     items: Application[];
-    total: number;
+    total: number | null;
     page: number;
     per_page: number;
 }
 
-export function useApplications(folderId?: number, page: number = 1, perPage: number = 25, sortBy: string = "updated_at", sortOrder: "asc" | "desc" = "desc") {
+export function useApplications(folderId?: number, page: number = 1, perPage: number = 25, sortBy: string = "updated_at", sortOrder: "asc" | "desc" = "desc", totalMode: TotalMode = "exact") {
     const baseUrl = folderId ? `/folders/${folderId}/applications` : "/applications/";
-    const endpoint = `${baseUrl}?page=${page}&per_page=${perPage}&sort_by=${sortBy}&sort_order=${sortOrder}`;
+    const endpoint = `${baseUrl}?page=${page}&per_page=${perPage}&sort_by=${sortBy}&sort_order=${sortOrder}&total=${totalMode}`;
     
     const { data, error, isLoading, mutate } = useSWR<ApplicationsResponse>(endpoint, apiRequest);
 
     return {
         applications: data?.items || [],
-        total: data?.total || 0,
+        total: data?.total ?? 0,
         page: data?.page || 1,
         per_page: data?.per_page || perPage,
         isLoading,
@@ -6,12 +6,14 @@ export interface Folder {
   title: string;
   position: number;
   count: number;
+  counts_per_status: Record<string, number>;
 }
 
 export interface FolderWithRecentApplications {
     folder: Folder;
     recent_applications: any[];
     application_count: number;
+    counts_per_status: Record<string, number>;
 }
 
 export interface DashboardResponse {